@@ -12,7 +12,10 @@ import numpy as np
 import os
 import re
 import hashlib
+import threading
 import gc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 warnings.filterwarnings('ignore')
 
@@ -23,12 +26,29 @@ def env_flag(name, default=False):
         return default
     return value.strip().lower() in {'1', 'true', 'yes', 'on'}
 
+def env_int(name, default):
+    """Parse a positive integer env var, falling back to default."""
+    value = os.environ.get(name)
+    try:
+        parsed = int(value) if value is not None else default
+    except ValueError:
+        return default
+    return parsed if parsed > 0 else default
+
 # Runtime modes controlled by environment variables
 DEBUG_MODE = env_flag('DEBUG_ANALYSIS', False)
 SAFE_MODE = env_flag('AUDIO_ANALYSIS_SAFE_MODE', False)
 DISABLE_ESSENTIA = SAFE_MODE or env_flag('AUDIO_ANALYSIS_DISABLE_ESSENTIA', False)
 DISABLE_TENSORFLOW = SAFE_MODE or env_flag('AUDIO_ANALYSIS_DISABLE_TENSORFLOW', False)
 DISABLE_FINGERPRINT = SAFE_MODE or env_flag('AUDIO_ANALYSIS_DISABLE_FINGERPRINT', False)
+USE_GPU = not SAFE_MODE and env_flag('AUDIO_ANALYSIS_USE_GPU', False)
+USE_MADMOM = not SAFE_MODE and env_flag('AUDIO_ANALYSIS_USE_MADMOM', False)
+# Python threads used to run independent feature extractors side by side
+# (each one keeps a single native thread, see the limits below); opt-in,
+# serial by default for stability
+ANALYSIS_THREADS = 1 if SAFE_MODE else env_int('AUDIO_ANALYSIS_THREADS', 1)
+# Directory for cached analysis results (unset = no caching)
+ANALYSIS_CACHE_DIR = os.environ.get('AUDIO_ANALYSIS_CACHE_DIR') or None
 
 # Native numeric libraries can over-subscribe CPU threads and destabilize
 # concurrent analyses under load; keep defaults conservative unless explicitly set.
@@ -56,11 +76,62 @@ def debug_log(message):
 try:
     import librosa
     import soundfile as sf
+    import scipy.signal
+    from scipy.ndimage import gaussian_filter1d, maximum_filter1d
 except ImportError as e:
     print(json.dumps({"error": f"Missing dependency: {e}. Install with: pip install librosa soundfile"}))
     sys.exit(1)
 
 
+def frame_rms(y, frame_length=2048, hop_length=512):
+    """
+    Same result as librosa.feature.rms(y=y)[0] (centered, zero-padded frames) in
+    one fused pass: the framed view is reduced with a single einsum instead of
+    separate abs/square/mean temporaries.
+    """
+    padded = np.pad(y, frame_length // 2)
+    frames = librosa.util.frame(padded, frame_length=frame_length, hop_length=hop_length)
+    return np.sqrt(np.einsum('ij,ij->j', frames, frames) / frame_length)
+
+
+def frame_zcr(y, frame_length=2048, hop_length=512):
+    """
+    Same result as librosa.feature.zero_crossing_rate(y)[0] (centered, edge-padded
+    frames, |x| <= 1e-10 counted as positive) without building the frame matrix:
+    sign changes are computed once over the signal and counted per frame from a
+    running sum.
+    """
+    padded = np.pad(y, frame_length // 2, mode='edge')
+    negative = np.signbit(padded)
+    negative[np.abs(padded) <= 1e-10] = False
+    crossings = np.concatenate(([0], np.cumsum(negative[1:] != negative[:-1])))
+    starts = np.arange(1 + (len(padded) - frame_length) // hop_length) * hop_length
+    return (crossings[starts + frame_length - 1] - crossings[starts]) / frame_length
+
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k largest scores in descending order, same as
+    np.argsort(scores)[::-1][:k] but selecting with argpartition (O(n)) and
+    sorting only the k selected entries.
+    """
+    if k >= len(scores):
+        return np.argsort(scores)[::-1]
+    top = np.argpartition(scores, -k)[-k:]
+    return top[np.argsort(scores[top])[::-1]]
+
+
+def first_true(mask, default):
+    """
+    Index of the first True entry of a boolean array, or default if there is none
+    (argmax stops at the first maximum, so the scan runs in C rather than Python).
+    """
+    if mask.size == 0:
+        return default
+    idx = int(np.argmax(mask))
+    return idx if mask[idx] else default
+
+
 def safe_onset_detect(y=None, sr=22050, onset_envelope=None, hop_length=512,
                       units='frames', backtrack=False, **kwargs):
     """
@@ -75,14 +146,15 @@ def safe_onset_detect(y=None, sr=22050, onset_envelope=None, hop_length=512,
     if onset_envelope is None:
         onset_envelope = librosa.onset.onset_strength(y=y, sr=sr, hop_length=hop_length)
 
-    # Normalize envelope to [0, 1] (same as librosa with normalize=True)
-    oenv = onset_envelope.astype(np.float64)
-    oenv_min = np.min(oenv)
-    oenv_max = np.max(oenv)
-    if oenv_max > oenv_min:
-        oenv = (oenv - oenv_min) / (oenv_max - oenv_min)
-    else:
+    # Normalize envelope to [0, 1] (same as librosa with normalize=True),
+    # in place on the float32 copy so no further temporaries are allocated
+    oenv = np.array(onset_envelope, dtype=np.float32)
+    oenv_min = oenv.min()
+    oenv_span = oenv.max() - oenv_min
+    if oenv_span <= 0:
         return np.array([], dtype=int)
+    oenv -= oenv_min
+    oenv /= oenv_span
 
     # Compute defaults exactly as librosa does (time-based, from sr/hop_length)
     pre_max = int(kwargs.get('pre_max', 0.03 * sr // hop_length))       # 30ms
@@ -96,50 +168,52 @@ def safe_onset_detect(y=None, sr=22050, onset_envelope=None, hop_length=512,
     #   1. x[n] == max(x[n - pre_max : n + post_max])
     #   2. x[n] >= mean(x[n - pre_avg : n + post_avg]) + delta
     #   3. n - previous_n > wait
+    # Conditions 1 and 2 are evaluated for all frames at once; only the wait
+    # gating, which depends on the previously accepted peak, walks the candidates
     n = len(oenv)
+    frames = np.arange(pre_max, n - post_max)
     peaks = []
-    last_peak = -wait - 1
 
-    for i in range(pre_max, n - post_max):
-        # Condition 1: local maximum
-        win_start = max(0, i - pre_max)
-        win_end = min(n, i + post_max + 1)
-        if oenv[i] != np.max(oenv[win_start:win_end]):
-            continue
+    if len(frames) > 0:
+        # Condition 1: local maximum (these max windows never cross the edges)
+        local_max = np.lib.stride_tricks.sliding_window_view(oenv, pre_max + post_max + 1).max(axis=1)
+        is_max = oenv[frames] == local_max
 
-        # Condition 2: above local mean + delta
-        avg_start = max(0, i - pre_avg)
-        avg_end = min(n, i + post_avg + 1)
-        if oenv[i] < np.mean(oenv[avg_start:avg_end]) + delta:
-            continue
+        # Condition 2: above local mean + delta (mean windows clipped at the edges)
+        running_sum = np.concatenate(([0.0], np.cumsum(oenv, dtype=np.float64)))
+        avg_start = np.maximum(frames - pre_avg, 0)
+        avg_end = np.minimum(frames + post_avg + 1, n)
+        local_mean = (running_sum[avg_end] - running_sum[avg_start]) / (avg_end - avg_start)
+        candidates = frames[is_max & (oenv[frames] >= local_mean + delta)]
 
         # Condition 3: minimum wait between peaks
-        if i - last_peak <= wait:
-            continue
-
-        peaks.append(i)
-        last_peak = i
+        last_peak = -wait - 1
+        for i in candidates.tolist():
+            if i - last_peak > wait:
+                peaks.append(i)
+                last_peak = i
 
     onset_frames = np.array(peaks, dtype=int)
 
     # Backtrack to nearest preceding energy minimum
     if backtrack and len(onset_frames) > 0 and y is not None:
-        energy = librosa.feature.rms(y=y, hop_length=hop_length)[0]
-        backtracked = []
-        for frame in onset_frames:
-            search_start = max(0, frame - pre_max * 2)
-            segment = energy[search_start:frame + 1]
-            if len(segment) > 0:
-                backtracked.append(search_start + int(np.argmin(segment)))
-            else:
-                backtracked.append(frame)
-        onset_frames = np.array(backtracked, dtype=int)
-
-    # Convert units
+        energy = frame_rms(y, hop_length=hop_length)
+        # Energy minimum in [frame - 2*pre_max, frame] for every onset at once;
+        # window slots past the end of the energy array are masked with +inf
+        search_start = np.maximum(onset_frames - pre_max * 2, 0)
+        search_end = np.minimum(onset_frames + 1, len(energy))
+        idx = search_start[:, None] + np.arange(pre_max * 2 + 1)[None, :]
+        windows = np.where(idx < search_end[:, None],
+                           energy[np.minimum(idx, len(energy) - 1)], np.inf)
+        backtracked = search_start + np.argmin(windows, axis=1)
+        onset_frames = np.where(search_end > search_start, backtracked, onset_frames).astype(int)
+
+    # Convert units (same arithmetic as librosa.frames_to_time/frames_to_samples
+    # with n_fft=None, without their per-call dispatch)
     if units == 'time':
-        return librosa.frames_to_time(onset_frames, sr=sr, hop_length=hop_length)
+        return (onset_frames * hop_length) / float(sr)
     elif units == 'samples':
-        return librosa.frames_to_samples(onset_frames, hop_length=hop_length)
+        return onset_frames * hop_length
     return onset_frames
 
 
@@ -155,49 +229,402 @@ else:
     essentia = None
     es = None
 
-# TensorFlow imports (Phase 4)
-if not DISABLE_TENSORFLOW:
-    try:
-        import tensorflow as tf
-        import tensorflow_hub as hub
-        # Suppress TensorFlow warnings
-        os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-        tf.get_logger().setLevel('ERROR')
-    except ImportError:
-        tf = None
-        hub = None
-else:
-    tf = None
-    hub = None
+# TensorFlow (Phase 4) and Acoustid/Chromaprint (Phase 6) are imported lazily on
+# first use (see load_tensorflow / load_acoustid): TensorFlow alone adds seconds
+# and hundreds of MB to startup, and with PANNs it is only needed as a fallback
+tf = None
+hub = None
+_tensorflow_checked = False
+acoustid = None
+_acoustid_checked = False
 
-# Acoustid/Chromaprint imports (Phase 6)
-if not DISABLE_FINGERPRINT:
+# pyloudnorm for EBU R128 loudness (Phase 5); small, so imported once up front
+try:
+    import pyloudnorm as pyln
+except ImportError:
+    # pyloudnorm is optional; loudness features are left empty without it
+    pyln = None
+
+# Optional FFTW backend for librosa's STFTs: plans are built once per frame size
+# and reused, which pays off across the repeated n_fft=2048 transforms
+if not SAFE_MODE:
     try:
-        import acoustid
-        import chromaprint
+        import pyfftw
+        import pyfftw.interfaces.numpy_fft
+        pyfftw.interfaces.cache.enable()
+        pyfftw.interfaces.cache.set_keepalive_time(60)
+        librosa.set_fftlib(pyfftw.interfaces.numpy_fft)
     except ImportError:
-        acoustid = None
-        chromaprint = None
+        # pyfftw is optional; librosa keeps numpy's FFT
+        pyfftw = None
 else:
-    acoustid = None
-    chromaprint = None
+    pyfftw = None
 
 # Global model cache (loaded once, reused across analyses)
 _yamnet_model = None
 _yamnet_class_names = None
+_yamnet_instrument_mask = None
+
+# Essentia algorithm instances, configured once per thread and reused across
+# analyses (instances are not thread-safe, so run_extractors threads never share
+# one; the extractor pool is long-lived, so each thread keeps its cache)
+_essentia_local = threading.local()
+
+# Torch handle for the optional CUDA STFT path (resolved lazily on first use)
+_torch_cuda = None
+_torch_cuda_checked = False
+
+
+def essentia_algorithm(name, **params):
+    """
+    Return a cached Essentia standard-mode algorithm (e.g. 'KeyExtractor'),
+    constructing it on first use. Instances are keyed by name and parameters,
+    cached per thread and reset before being handed out.
+    """
+    algorithms = getattr(_essentia_local, 'algorithms', None)
+    if algorithms is None:
+        algorithms = _essentia_local.algorithms = {}
+    key = (name, tuple(sorted(params.items())))
+    algorithm = algorithms.get(key)
+    if algorithm is None:
+        algorithm = getattr(es, name)(**params)
+        algorithms[key] = algorithm
+    else:
+        algorithm.reset()
+    return algorithm
+
+
+def load_torch_cuda():
+    """
+    Import torch for the GPU STFT path (cached globally).
+    Returns the torch module when AUDIO_ANALYSIS_USE_GPU is set and CUDA is available, else None.
+    """
+    global _torch_cuda, _torch_cuda_checked
+
+    if _torch_cuda_checked:
+        return _torch_cuda
+    _torch_cuda_checked = True
+
+    if not USE_GPU:
+        return None
+
+    try:
+        import torch
+    except ImportError:
+        debug_log("torch not installed, GPU STFT disabled")
+        return None
+
+    if not torch.cuda.is_available():
+        debug_log("CUDA not available, GPU STFT disabled")
+        return None
+
+    debug_log(f"GPU STFT enabled on {torch.cuda.get_device_name(0)}")
+    _torch_cuda = torch
+    return _torch_cuda
+
+
+def load_tensorflow():
+    """
+    Import TensorFlow and TensorFlow Hub for YAMNet (cached globally).
+    Returns the tensorflow_hub module, or None when disabled or not installed.
+    """
+    global tf, hub, _tensorflow_checked
+
+    if _tensorflow_checked:
+        return hub
+    _tensorflow_checked = True
+
+    if DISABLE_TENSORFLOW:
+        return None
+
+    # Suppress TensorFlow warnings (must be set before the import)
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+    try:
+        import_start = time.time()
+        import tensorflow
+        import tensorflow_hub
+    except ImportError:
+        debug_log("TensorFlow/Hub not installed")
+        return None
+
+    tensorflow.get_logger().setLevel('ERROR')
+    # YAMNet runs on a visible GPU automatically; grow its memory on demand so it can
+    # share the device with the torch STFT/PANNs paths instead of reserving all of it
+    try:
+        gpus = tensorflow.config.list_physical_devices('GPU')
+        for gpu in gpus:
+            tensorflow.config.experimental.set_memory_growth(gpu, True)
+        if gpus:
+            debug_log(f"TensorFlow using {len(gpus)} GPU(s) for YAMNet")
+    except Exception as e:
+        debug_log(f"TensorFlow GPU setup failed: {e}")
+    debug_log(f"TensorFlow imported [{(time.time()-import_start)*1000:.0f}ms]")
+    tf, hub = tensorflow, tensorflow_hub
+    return hub
+
+
+def load_acoustid():
+    """
+    Import pyacoustid for Chromaprint fingerprinting (cached globally).
+    Returns the acoustid module, or None when disabled or acoustid/chromaprint is not installed.
+    """
+    global acoustid, _acoustid_checked
+
+    if _acoustid_checked:
+        return acoustid
+    _acoustid_checked = True
+
+    if DISABLE_FINGERPRINT:
+        return None
+
+    try:
+        import acoustid as acoustid_module
+        import chromaprint
+    except ImportError:
+        debug_log("acoustid/chromaprint not installed, Chromaprint fingerprinting disabled")
+        return None
+
+    acoustid = acoustid_module
+    return acoustid
+
+
+def compute_stft(y, n_fft=2048, hop_length=512):
+    """
+    Complex STFT with librosa's defaults (periodic hann window, centered, zero padded).
+    Runs on CUDA through torch when the GPU path is enabled, otherwise uses librosa.stft.
+    """
+    torch = load_torch_cuda()
+    if torch is not None:
+        try:
+            signal = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32)).to('cuda')
+            window = torch.hann_window(n_fft, periodic=True, device='cuda')
+            D = torch.stft(
+                signal, n_fft=n_fft, hop_length=hop_length, window=window,
+                center=True, pad_mode='constant', return_complex=True,
+            )
+            return D.cpu().numpy()
+        except Exception as e:
+            debug_log(f"GPU STFT failed, falling back to librosa: {e}")
+
+    return librosa.stft(y, n_fft=n_fft, hop_length=hop_length)
+
+
+def separate_hpss(D, length):
+    """
+    Harmonic/percussive waveforms from a complex STFT with librosa's defaults;
+    same result as librosa.effects.hpss(y) when D = stft(y), without the
+    forward transform. Returns (y_harmonic, y_percussive).
+    """
+    H, P = librosa.decompose.hpss(D)
+    return librosa.istft(H, length=length), librosa.istft(P, length=length)
+
+
+# Frames decoded per block when streaming multichannel files into a mono buffer
+LOAD_BLOCK_FRAMES = 65536
+
+# Analysis frames windowed and transformed per batch in the Essentia timbral pass
+TIMBRAL_BLOCK_FRAMES = 512
+
+
+def load_audio(audio_path, sr=44100):
+    """
+    Decode an audio file once, to mono float32 at the target sample rate plus
+    the first two channels for stereo analysis.
+    Reads through soundfile directly, skipping librosa.load's generic wrapper,
+    and falls back to librosa.load (audioread) for formats libsndfile can't decode.
+    Multichannel files are streamed block by block into preallocated mono and
+    stereo buffers instead of materializing the full interleaved waveform.
+    Returns (y, sr, y_stereo); y_stereo is None for mono files.
+    """
+    try:
+        with sf.SoundFile(audio_path) as f:
+            native_sr = f.samplerate
+            n_channels = f.channels
+            y_stereo = None
+            if n_channels == 1:
+                y = f.read(dtype='float32')
+            else:
+                y = np.empty(max(f.frames, 0), dtype=np.float32)
+                y_stereo = np.empty((2, len(y)), dtype=np.float32)
+                block = np.empty((LOAD_BLOCK_FRAMES, n_channels), dtype=np.float32)
+                pos = 0
+                while True:
+                    chunk = f.read(out=block)
+                    n = len(chunk)
+                    if n == 0:
+                        break
+                    if pos + n > len(y):
+                        # Header frame count was short; grow the buffers
+                        grow = max(n, pos)
+                        y = np.concatenate([y[:pos], np.empty(grow, dtype=np.float32)])
+                        y_stereo = np.concatenate(
+                            [y_stereo[:, :pos], np.empty((2, grow), dtype=np.float32)], axis=1
+                        )
+                    # Downmix by channel mean (same as librosa.to_mono)
+                    np.mean(chunk, axis=1, out=y[pos:pos + n])
+                    y_stereo[:, pos:pos + n] = chunk[:, :2].T
+                    pos += n
+                y = y[:pos]
+                y_stereo = y_stereo[:, :pos]
+    except RuntimeError as e:
+        debug_log(f"soundfile could not decode file ({e}), falling back to librosa.load")
+        y_multi, sr = librosa.load(audio_path, sr=sr, mono=False)
+        if y_multi.ndim == 1:
+            return y_multi, sr, None
+        return librosa.to_mono(y_multi), sr, y_multi[:2]
+
+    if native_sr != sr:
+        # soxr_hq is pinned explicitly (librosa's default may change); it is
+        # faster than scipy's resample_poly for the usual 48k -> 44.1k case
+        if y_stereo is None:
+            y = librosa.resample(y, orig_sr=native_sr, target_sr=sr, res_type='soxr_hq')
+        else:
+            y_stereo = librosa.resample(y_stereo, orig_sr=native_sr, target_sr=sr, res_type='soxr_hq')
+            if n_channels == 2:
+                # Resampling is linear: downmix the resampled pair instead of
+                # resampling a third channel
+                y = np.mean(y_stereo, axis=0)
+            else:
+                y = librosa.resample(y, orig_sr=native_sr, target_sr=sr, res_type='soxr_hq')
+    return y, sr, y_stereo
+
+
+def trim_silence(y, top_db=60, frame_length=2048, hop_length=512):
+    """
+    Same result as librosa.effects.trim(y, top_db=top_db) for mono audio, with
+    the frame energies taken from frame_rms instead of librosa.feature.rms
+    (which dominates trim's cost). Returns (y_trimmed, [start, end]).
+    """
+    db = librosa.amplitude_to_db(frame_rms(y, frame_length=frame_length, hop_length=hop_length),
+                                 ref=np.max, top_db=None)
+    nonsilent = np.flatnonzero(db > -top_db)
+    if nonsilent.size > 0:
+        start = int(nonsilent[0]) * hop_length
+        end = min(len(y), (int(nonsilent[-1]) + 1) * hop_length)
+    else:
+        start, end = 0, 0
+    return y[start:end], np.asarray([start, end])
 
 
 def preprocess_audio(y, sr):
     """Remove DC offset, trim silence, and peak-normalize the audio."""
-    y_original = y.copy()          # Keep for EBU R128 (needs absolute levels)
-    y = y - np.mean(y)             # DC offset removal
-    y, trim_idx = librosa.effects.trim(y, top_db=30)  # Silence trimming
-    peak = np.max(np.abs(y))
+    y_original = y                 # Keep for EBU R128 (needs absolute levels); not modified below
+    y = y - np.mean(y)             # DC offset removal (new array, so normalization can run in place)
+    y, trim_idx = trim_silence(y, top_db=30)  # Silence trimming
+    peak = max(y.max(), -y.min()) if len(y) > 0 else 0.0
     if peak > 1e-8:
-        y = y / peak               # Peak normalization
+        y /= peak                  # Peak normalization
     return y, y_original, trim_idx
 
 
+# Hash of this script, so cached results are dropped whenever the analysis code changes
+_analysis_code_hash = None
+
+# Stages whose errors were swallowed during the current analysis; such a
+# degraded result is returned but never written to the analysis cache
+_degraded_stages = set()
+
+
+def mark_stage_degraded(stage):
+    """Record that an analysis stage failed and fell back during this analysis"""
+    _degraded_stages.add(stage)
+
+
+def analysis_cache_path(audio_path, analysis_level, filename=None):
+    """
+    Path of the cached result for this file content, analysis level, filename hint,
+    runtime mode flags and analysis code version, or None when AUDIO_ANALYSIS_CACHE_DIR
+    is not set or safe mode is on (safe-mode results are stripped down and must
+    neither be served from nor stored in the cache)
+    """
+    global _analysis_code_hash
+
+    if ANALYSIS_CACHE_DIR is None or SAFE_MODE:
+        return None
+
+    try:
+        if _analysis_code_hash is None:
+            with open(os.path.abspath(__file__), 'rb') as f:
+                _analysis_code_hash = hashlib.sha256(f.read()).hexdigest()
+
+        key = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                key.update(chunk)
+        key.update(f"\0{analysis_level}\0{filename or ''}\0{_analysis_code_hash}".encode('utf-8'))
+        # Feature flags change which stages run and which models produce the results
+        flags = (DISABLE_ESSENTIA, DISABLE_TENSORFLOW, DISABLE_FINGERPRINT,
+                 USE_YAMNET, USE_MADMOM, USE_GPU)
+        key.update(''.join('1' if flag else '0' for flag in flags).encode('ascii'))
+        return os.path.join(ANALYSIS_CACHE_DIR, f"{key.hexdigest()}.json")
+    except Exception as e:
+        print(f"Warning: Analysis cache key failed: {e}", file=sys.stderr)
+        return None
+
+
+def load_cached_analysis(cache_path):
+    """Return the cached features dict at cache_path, or None on a miss"""
+    if cache_path is None or not os.path.exists(cache_path):
+        return None
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: Failed to read analysis cache: {e}", file=sys.stderr)
+        return None
+
+
+def save_cached_analysis(cache_path, features):
+    """Write features to cache_path atomically (no-op when caching is disabled)"""
+    if cache_path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(features, f)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Warning: Failed to write analysis cache: {e}", file=sys.stderr)
+
+
+# Thread pool for run_extractors, created on first use and kept for the life of
+# the process so its threads (and their per-thread Essentia caches) are reused
+_extractor_pool = None
+
+
+def get_extractor_pool():
+    """Return the process-wide extractor thread pool (ANALYSIS_THREADS workers)"""
+    global _extractor_pool
+
+    if _extractor_pool is None:
+        _extractor_pool = ThreadPoolExecutor(max_workers=ANALYSIS_THREADS,
+                                             thread_name_prefix='extractor')
+    return _extractor_pool
+
+
+def run_extractors(tasks):
+    """
+    Run independent feature extractors, concurrently when ANALYSIS_THREADS > 1.
+    Args:
+        tasks: list of (key, label, fn, args) tuples; label is used for debug timing
+    Returns dict mapping key -> fn(*args). Extractors handle their own errors;
+    anything they raise propagates to the caller as in serial execution.
+    """
+    def timed(label, fn, args):
+        step_start = time.time()
+        result = fn(*args)
+        debug_log(f"{label} [{(time.time()-step_start)*1000:.0f}ms]")
+        return result
+
+    if ANALYSIS_THREADS <= 1 or len(tasks) <= 1:
+        return {key: timed(label, fn, args) for key, label, fn, args in tasks}
+
+    pool = get_extractor_pool()
+    futures = {key: pool.submit(timed, label, fn, args) for key, label, fn, args in tasks}
+    return {key: future.result() for key, future in futures.items()}
+
+
 def analyze_audio(audio_path, analysis_level='advanced', filename=None):
     """
     Main audio analysis function
@@ -211,27 +638,86 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
     if SAFE_MODE:
         debug_log("Safe mode enabled: skipping Essentia/TensorFlow/Chromaprint-backed stages")
 
+    # Unchanged files re-analyzed by the same code come straight from the cache
+    cache_path = analysis_cache_path(audio_path, analysis_level, filename)
+    cached = load_cached_analysis(cache_path)
+    if cached is not None:
+        # Report this run's (cache hit) duration, not the original analysis time
+        cached['analysis_duration_ms'] = int((time.time() - start_time) * 1000)
+        debug_log(f"=== Analysis loaded from cache: {cache_path} [{cached['analysis_duration_ms']}ms] ===")
+        return cached
+    _degraded_stages.clear()
+
     try:
         # Load audio
         step_start = time.time()
-        y, sr = librosa.load(audio_path, sr=44100, mono=True)
-        duration = librosa.get_duration(y=y, sr=sr)
+        y, sr, y_stereo = load_audio(audio_path, sr=44100)
+        duration = y.shape[0] / sr
         debug_log(f"Audio loaded: duration={duration:.2f}s, sr={sr}Hz [{(time.time()-step_start)*1000:.0f}ms]")
 
         # Preprocess audio
         step_start = time.time()
         y, y_original, trim_idx = preprocess_audio(y, sr)
-        duration = librosa.get_duration(y=y, sr=sr)
+        # Contiguous float32 from here on, so Essentia and the framing helpers
+        # can use it without per-stage copies
+        y = np.ascontiguousarray(y, dtype=np.float32)
+        duration = y.shape[0] / sr
         debug_log(f"Audio preprocessed: trimmed duration={duration:.2f}s, trim_idx={trim_idx} [{(time.time()-step_start)*1000:.0f}ms]")
 
-        # Extract features FIRST (needed for instrument and sample type detection)
+        # STFT, computed once: its magnitude is shared by the spectral and additional
+        # features, and the harmonic/percussive split by polyphony and HPSS features
+        step_start = time.time()
+        D = compute_stft(y)
+        S = np.abs(D)
+        # 128-band log-power mel spectrogram, shared by the onset envelope and the MFCCs
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S ** 2, sr=sr))
+        debug_log(f"STFT computed [{(time.time()-step_start)*1000:.0f}ms]")
+
+        # Onset strength envelope, computed once from the shared mel spectrogram and
+        # shared by energy, sample type, onset counting, tempo and rhythm analysis
+        step_start = time.time()
+        try:
+            onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr)
+        except Exception:
+            onset_env = None
+        # Onset frames at the default peak-picking settings, shared the same way
+        try:
+            onset_frames = safe_onset_detect(
+                y=y, sr=sr, onset_envelope=onset_env, units='frames', hop_length=512
+            )
+        except Exception:
+            onset_frames = None
+        debug_log(f"Onset envelope and onsets computed [{(time.time()-step_start)*1000:.0f}ms]")
+
+        # RMS envelope (frame 2048, hop 512), shared by energy, sample type, ADSR,
+        # event validation and additional features
         step_start = time.time()
-        spectral_features = extract_spectral_features(y, sr, level=analysis_level)
-        debug_log(f"Spectral features extracted [{(time.time()-step_start)*1000:.0f}ms]")
+        rms = frame_rms(y)
+        debug_log(f"RMS envelope computed [{(time.time()-step_start)*1000:.0f}ms]")
 
         step_start = time.time()
-        energy_features = extract_energy_features(y, sr)
-        debug_log(f"Energy features extracted [{(time.time()-step_start)*1000:.0f}ms]")
+        try:
+            y_harmonic, y_percussive = separate_hpss(D, len(y))
+        except Exception as e:
+            print(f"Warning: Harmonic/percussive separation failed: {e}", file=sys.stderr)
+            mark_stage_degraded('hpss')
+            y_harmonic, y_percussive = None, None
+        del D
+        debug_log(f"Harmonic/percussive separation [{(time.time()-step_start)*1000:.0f}ms]")
+
+        # Extract features FIRST (needed for instrument and sample type detection).
+        # Additional features, polyphony and the fingerprint don't depend on the
+        # sample type, so they run in the same batch (see ANALYSIS_THREADS)
+        core_results = run_extractors([
+            ('spectral', "Spectral features extracted", extract_spectral_features,
+             (y, sr, analysis_level, S, mel_db)),
+            ('energy', "Energy features extracted", extract_energy_features, (y, sr, onset_env, rms)),
+            ('additional', "Additional features extracted", extract_additional_features, (y, sr, rms, S)),
+            ('polyphony', "Polyphony estimated", estimate_polyphony, (y, sr, y_harmonic)),
+            ('fingerprint', "Phase 6: Audio fingerprinting", extract_fingerprint, (audio_path, y, sr)),
+        ])
+        spectral_features = core_results['spectral']
+        energy_features = core_results['energy']
 
         # Detect instruments (needed for sample type classification)
         step_start = time.time()
@@ -243,14 +729,13 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
         # NOW detect sample type with instrument context
         step_start = time.time()
         is_one_shot, is_loop, sample_type_confidence = detect_sample_type(
-            y, sr, duration, filename, instrument_predictions
+            y, sr, duration, filename, instrument_predictions,
+            onset_env=onset_env, onset_frames=onset_frames, rms=rms
         )
         debug_log(f"Sample type detected: one_shot={is_one_shot}, loop={is_loop}, confidence={sample_type_confidence:.3f} [{(time.time()-step_start)*1000:.0f}ms]")
 
-        # Extract additional features (all levels - cheap to compute)
-        step_start = time.time()
-        additional_features = extract_additional_features(y, sr)
-        debug_log(f"Additional features extracted [{(time.time()-step_start)*1000:.0f}ms]")
+        # Additional features (all levels - cheap to compute)
+        additional_features = core_results['additional']
 
         # Extract fundamental frequency for one-shots (excluding chords)
         fundamental_freq = None
@@ -275,16 +760,15 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
                 key_features = extract_key_features(y, sr)
                 debug_log(f"Key features extracted: {key_features['key_estimate']} [{(time.time()-step_start)*1000:.0f}ms]")
 
-        # Estimate polyphony (approximate simultaneous note count)
-        step_start = time.time()
-        polyphony = estimate_polyphony(y, sr)
-        debug_log(f"Polyphony estimated: {polyphony if polyphony is not None else 'n/a'} [{(time.time()-step_start)*1000:.0f}ms]")
+        # Polyphony (approximate simultaneous note count)
+        polyphony = core_results['polyphony']
+        debug_log(f"Polyphony: {polyphony if polyphony is not None else 'n/a'}")
 
         # Extract tempo only for loops (advanced only)
         tempo_features = {}
         if is_loop and duration > 1.5 and analysis_level == 'advanced':
             step_start = time.time()
-            tempo_features = extract_tempo_features(y, sr)
+            tempo_features = extract_tempo_features(y, sr, onset_env=onset_env)
             debug_log(f"Tempo extracted: {tempo_features.get('bpm')} BPM [{(time.time()-step_start)*1000:.0f}ms]")
 
         # Build features dict
@@ -294,7 +778,7 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
             'is_one_shot': bool(is_one_shot),
             'is_loop': bool(is_loop),
             'sample_type_confidence': float(sample_type_confidence),
-            'onset_count': int(count_onsets(y, sr)),
+            'onset_count': int(count_onsets(y, sr, onset_env=onset_env, onset_frames=onset_frames)),
             'analysis_level': analysis_level,
             # Spectral
             'spectral_centroid': float(spectral_features['spectral_centroid']),
@@ -327,10 +811,7 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
         }
 
         # Phase 6: Fingerprinting/hash for duplicate detection (all analysis levels)
-        step_start = time.time()
-        fingerprint_features = extract_fingerprint(audio_path, y, sr)
-        debug_log(f"Phase 6: Audio fingerprinting [{(time.time()-step_start)*1000:.0f}ms]")
-        features.update(fingerprint_features)
+        features.update(core_results['fingerprint'])
 
         # Advanced level: Add Phase 1 features (timbral, perceptual, spectral)
         if analysis_level == 'advanced':
@@ -341,10 +822,24 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
                 features['mel_bands_mean'] = spectral_features['mel_bands_mean']
                 features['mel_bands_std'] = spectral_features['mel_bands_std']
 
+            # Phases that only read the audio and don't depend on each other run
+            # side by side (see ANALYSIS_THREADS); results are merged in the usual order
+            phase_results = run_extractors([
+                ('timbral', "Phase 1: Timbral features (Essentia)", extract_timbral_features, (y, sr)),
+                ('stereo', "Phase 2: Stereo analysis", extract_stereo_features, (y_stereo, sr)),
+                ('hpss', "Phase 2: HPSS features", extract_hpss_features,
+                 (y, sr, y_harmonic, y_percussive)),
+                ('rhythm', "Phase 3: Rhythm features", extract_rhythm_features,
+                 (y, sr, duration, tempo_features, onset_env, onset_frames)),
+                ('adsr', "Phase 3: ADSR envelope", extract_adsr_envelope, (y, sr, rms)),
+                ('loudness_ebu', "Phase 5: EBU R128 loudness", extract_loudness_ebu, (y_original, sr)),
+                ('events', "Phase 5: Sound event detection", detect_sound_events, (y, sr, duration, rms)),
+                ('ml_instruments', "Phase 4: ML instrument classification", extract_instrument_ml_auto,
+                 (audio_path, y, sr)),
+            ])
+
             # Timbral features (Essentia)
-            step_start = time.time()
-            timbral_features = extract_timbral_features(y, sr)
-            debug_log(f"Phase 1: Timbral features (Essentia) [{(time.time()-step_start)*1000:.0f}ms]")
+            timbral_features = phase_results['timbral']
             features.update(timbral_features)
 
             # Perceptual features (derived)
@@ -356,15 +851,10 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
             features.update(perceptual_features)
 
             # Phase 2: Stereo analysis
-            step_start = time.time()
-            stereo_features = extract_stereo_features(audio_path, sr)
-            debug_log(f"Phase 2: Stereo analysis [{(time.time()-step_start)*1000:.0f}ms]")
-            features.update(stereo_features)
+            features.update(phase_results['stereo'])
 
             # Phase 2: Harmonic/Percussive separation
-            step_start = time.time()
-            hpss_features, y_percussive = extract_hpss_features(y, sr)
-            debug_log(f"Phase 2: HPSS separation [{(time.time()-step_start)*1000:.0f}ms]")
+            hpss_features, y_percussive = phase_results['hpss']
             features.update(hpss_features)
 
             # Transient features (reuse y_percussive from HPSS)
@@ -374,31 +864,13 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
             features.update(transient_features)
 
             # Phase 3: Advanced rhythm features
-            step_start = time.time()
-            rhythm_features = extract_rhythm_features(y, sr, duration, tempo_features)
-            debug_log(f"Phase 3: Rhythm features [{(time.time()-step_start)*1000:.0f}ms]")
-            features.update(rhythm_features)
+            features.update(phase_results['rhythm'])
 
             # Phase 3: ADSR envelope
-            step_start = time.time()
-            adsr_features = extract_adsr_envelope(y, sr)
-            debug_log(f"Phase 3: ADSR envelope [{(time.time()-step_start)*1000:.0f}ms]")
-            features.update(adsr_features)
+            features.update(phase_results['adsr'])
 
             # Phase 4: ML-based instrument classification (PANNs CNN14 or YAMNet)
-            step_start = time.time()
-            if USE_YAMNET:
-                ml_instrument_features = extract_instrument_ml(audio_path, y, sr)
-                debug_log(f"Phase 4: YAMNet instrument classification [{(time.time()-step_start)*1000:.0f}ms]")
-            else:
-                ml_instrument_features = extract_instrument_ml_panns(audio_path, y, sr)
-                debug_log(f"Phase 4: PANNs CNN14 instrument classification [{(time.time()-step_start)*1000:.0f}ms]")
-                # If PANNs failed (not installed), fall back to YAMNet
-                if ml_instrument_features.get('instrument_classes') is None:
-                    debug_log("PANNs unavailable, falling back to YAMNet")
-                    step_start = time.time()
-                    ml_instrument_features = extract_instrument_ml(audio_path, y, sr)
-                    debug_log(f"Phase 4: YAMNet fallback [{(time.time()-step_start)*1000:.0f}ms]")
+            ml_instrument_features = phase_results['ml_instruments']
             features.update(ml_instrument_features)
 
             # Phase 4: Genre/mood classification (heuristics + YAMNet)
@@ -417,16 +889,10 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
             features.update(genre_features)
 
             # Phase 5: EBU R128 loudness analysis
-            step_start = time.time()
-            loudness_ebu_features = extract_loudness_ebu(y_original, sr)
-            debug_log(f"Phase 5: EBU R128 loudness [{(time.time()-step_start)*1000:.0f}ms]")
-            features.update(loudness_ebu_features)
+            features.update(phase_results['loudness_ebu'])
 
             # Phase 5: Sound event detection
-            step_start = time.time()
-            event_features = detect_sound_events(y, sr, duration)
-            debug_log(f"Phase 5: Sound event detection [{(time.time()-step_start)*1000:.0f}ms]")
-            features.update(event_features)
+            features.update(phase_results['events'])
 
         # Generate tags from features
         step_start = time.time()
@@ -440,6 +906,10 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
 
         debug_log(f"=== Analysis complete: {total_duration:.0f}ms total ===")
 
+        if _degraded_stages:
+            debug_log(f"Not caching result, degraded stages: {', '.join(sorted(_degraded_stages))}")
+        else:
+            save_cached_analysis(cache_path, features)
         return features
 
     except Exception as e:
@@ -447,7 +917,27 @@ def analyze_audio(audio_path, analysis_level='advanced', filename=None):
         raise Exception(f"Audio analysis failed: {str(e)}")
 
 
-def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=None):
+# Percussion/one-shot/loop keywords for filename and instrument detection,
+# matched as substrings with one precompiled alternation per set
+_PERC_KEYWORD_RE = re.compile('|'.join(map(re.escape, [
+    'kick', 'snare', 'hat', 'hihat', 'hi-hat', 'hh',
+    'crash', 'ride', 'tom', 'clap', 'rim', 'shaker',
+    'tambourine', 'cowbell', 'perc', 'conga', 'bongo',
+    'cymbal', 'openhat', 'closedhat', 'oh', 'ch',
+])))
+_ONESHOT_KEYWORD_RE = re.compile('|'.join(map(re.escape, [
+    'shot', 'hit', 'one', 'single', 'oneshot', 'one-shot',
+    'one_shot', 'stab', 'impact', 'fx', 'riser', 'sweep',
+    'boom', 'whoosh', 'transition',
+])))
+_LOOP_KEYWORD_RE = re.compile('|'.join(map(re.escape, [
+    'loop', 'beat', 'groove', 'pattern', 'break', 'fill',
+])))
+_BPM_HINT_RE = re.compile(r'\d+\s*bpm')
+
+
+def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=None, onset_env=None,
+                       onset_frames=None, rms=None):
     """
     Detect if audio is a one-shot or loop using multi-evidence voting.
 
@@ -462,6 +952,9 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
         duration: Duration in seconds
         filename: Original filename (optional)
         instrument_predictions: Pre-calculated instrument predictions from heuristics (optional)
+        onset_env: Pre-calculated onset strength envelope (optional)
+        onset_frames: Pre-calculated onset frames at default peak picking (optional)
+        rms: Pre-calculated RMS envelope (optional)
 
     Returns (is_one_shot, is_loop, confidence).
     """
@@ -473,30 +966,20 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
     if duration < 2.0:
         return (True, False, 1.0)
 
-    # --- Percussion/one-shot keywords for both filename and instrument detection ---
-    perc_keywords = ['kick', 'snare', 'hat', 'hihat', 'hi-hat', 'hh',
-                     'crash', 'ride', 'tom', 'clap', 'rim', 'shaker',
-                     'tambourine', 'cowbell', 'perc', 'conga', 'bongo',
-                     'cymbal', 'openhat', 'closedhat', 'oh', 'ch']
-    os_keywords = ['shot', 'hit', 'one', 'single', 'oneshot', 'one-shot',
-                   'one_shot', 'stab', 'impact', 'fx', 'riser', 'sweep',
-                   'boom', 'whoosh', 'transition']
-    loop_keywords = ['loop', 'beat', 'groove', 'pattern', 'break', 'fill']
-
     is_percussion_sample = False
 
     # --- Check filename for keywords ---
     if filename:
         fname_lower = filename.lower()
 
-        if any(kw in fname_lower for kw in perc_keywords):
+        if _PERC_KEYWORD_RE.search(fname_lower):
             is_percussion_sample = True
             os_score += 5.0  # Very strong one-shot signal
 
-        if any(kw in fname_lower for kw in os_keywords):
+        if _ONESHOT_KEYWORD_RE.search(fname_lower):
             os_score += 4.0
 
-        if any(kw in fname_lower for kw in loop_keywords):
+        if _LOOP_KEYWORD_RE.search(fname_lower):
             loop_score += 4.0
 
     # --- NEW: Check instrument predictions (from heuristic analysis) ---
@@ -508,17 +991,14 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
             confidence = pred.get('confidence', 0.0)
 
             # High-confidence percussion detection -> strong one-shot signal
-            if confidence >= 0.60:
-                for perc_kw in perc_keywords:
-                    if perc_kw in instrument_name:
-                        is_percussion_sample = True
-                        os_score += 4.0  # Strong one-shot signal (slightly less than filename)
-                        break
-                if is_percussion_sample:
-                    break  # Only apply bonus once
+            if confidence >= 0.60 and _PERC_KEYWORD_RE.search(instrument_name):
+                is_percussion_sample = True
+                os_score += 4.0  # Strong one-shot signal (slightly less than filename)
+                break  # Only apply bonus once
 
     # --- Evidence 1: RMS envelope shape (weight 2.0) ---
-    rms = librosa.feature.rms(y=y)[0]
+    if rms is None:
+        rms = frame_rms(y)
 
     # Trim RMS to the "active" region using two complementary methods:
     #   1. RMS threshold — frames below -30 dB relative to peak are noise/silence
@@ -530,28 +1010,28 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
     rms_trimmed = rms
     if len(rms) > 10:
         # Method 1: RMS energy threshold
-        rms_peak = np.max(rms)
+        rms_peak = rms.max()
         noise_threshold = rms_peak * 0.03  # ~-30 dB below peak
         active_mask = rms > noise_threshold
-        active_indices = np.where(active_mask)[0]
-        if len(active_indices) >= 2:
-            rms_start = active_indices[0]
-            rms_end = active_indices[-1]
-        else:
+        # First/last active frame via argmax (stops at the first hit) instead
+        # of materialising every active index with np.where
+        rms_start = int(np.argmax(active_mask))
+        rms_end = len(rms) - 1 - int(np.argmax(active_mask[::-1]))
+        if not (active_mask[rms_start] and rms_end > rms_start):
             rms_start = 0
             rms_end = len(rms) - 1
 
         # Method 2: Onset detection (with stricter delta to reduce false positives)
         try:
-            onset_frames = safe_onset_detect(
-                y=y, sr=sr, units='frames', hop_length=512, delta=0.15
+            strict_onsets = safe_onset_detect(
+                y=y, sr=sr, onset_envelope=onset_env, units='frames', hop_length=512, delta=0.15
             )
         except Exception:
-            onset_frames = np.array([])
+            strict_onsets = np.array([])
 
-        if len(onset_frames) >= 1:
-            onset_start = onset_frames[0]
-            onset_end = onset_frames[-1]
+        if len(strict_onsets) >= 1:
+            onset_start = strict_onsets[0]
+            onset_end = strict_onsets[-1]
         else:
             onset_start = rms_start
             onset_end = rms_end
@@ -570,10 +1050,11 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
             os_score += 1.5  # >25% of frames are noise floor -> not a loop
 
     if len(rms_trimmed) > 10:
-        peak_idx = np.argmax(rms_trimmed)
-        peak_pos_ratio = peak_idx / len(rms_trimmed)
-        tail_start = min(peak_idx + 5, len(rms_trimmed) - 1)
-        tail_mean = np.mean(rms_trimmed[tail_start:]) + 1e-8
+        n_trimmed = len(rms_trimmed)
+        peak_idx = int(np.argmax(rms_trimmed))
+        peak_pos_ratio = peak_idx / n_trimmed
+        tail_start = min(peak_idx + 5, n_trimmed - 1)
+        tail_mean = rms_trimmed[tail_start:].mean() + 1e-8
         peak_tail_ratio = rms_trimmed[peak_idx] / tail_mean
 
         # Clear decay from early peak -> one-shot
@@ -584,10 +1065,12 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
             os_score += 1.5
 
         # Very flat RMS is loop evidence, but only a weak signal
-        # (many sustained sounds like pads/strings have flat RMS and aren't loops)
-        rms_cv = np.std(rms_trimmed) / (np.mean(rms_trimmed) + 1e-8)  # coefficient of variation
-        if peak_tail_ratio < 1.3 and rms_cv < 0.15:
-            loop_score += 1.0  # Very flat, low variance — mild loop signal
+        # (many sustained sounds like pads/strings have flat RMS and aren't loops).
+        # The variance pass is only needed once the peak/tail check has passed.
+        if peak_tail_ratio < 1.3:
+            rms_cv = rms_trimmed.std() / (rms_trimmed.mean() + 1e-8)  # coefficient of variation
+            if rms_cv < 0.15:
+                loop_score += 1.0  # Very flat, low variance — mild loop signal
 
     # --- Evidence 2: Start-end similarity on active content (weight 1.5) ---
     # A seamless loop should have very similar energy at start and end.
@@ -599,7 +1082,14 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
         start_segment = rms_trimmed[:window_frames]
         end_segment = rms_trimmed[-window_frames:]
         if len(start_segment) == len(end_segment) and len(start_segment) > 2:
-            corr = np.corrcoef(start_segment, end_segment)[0, 1]
+            # Pearson from centred dot products instead of np.corrcoef's 2x2 matrix;
+            # flat segments give NaN and are skipped, as with corrcoef
+            a = start_segment.astype(np.float64)
+            a -= a.mean()
+            b = end_segment.astype(np.float64)
+            b -= b.mean()
+            denom = np.sqrt(np.dot(a, a) * np.dot(b, b))
+            corr = np.dot(a, b) / denom if denom > 0 else np.nan
             if not np.isnan(corr):
                 if corr < 0.3:
                     os_score += 1.5  # Very different start/end -> one-shot
@@ -611,10 +1101,14 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
     # --- Evidence 3: Onset periodicity (weight 1.5) ---
     # Loops have clearly periodic onsets (repeating rhythmic pattern)
     try:
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        if onset_env is None:
+            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
         if len(onset_env) > 20:
-            autocorr = np.correlate(onset_env, onset_env, mode='full')
-            autocorr = autocorr[len(autocorr) // 2:]
+            # FFT autocorrelation (non-negative lags), zero-padded against wrap-around
+            n_env = len(onset_env)
+            n_fft = 1 << (2 * n_env - 1).bit_length()
+            env_fft = np.fft.rfft(onset_env, n=n_fft)
+            autocorr = np.fft.irfft(env_fft * np.conj(env_fft), n=n_fft)[:n_env]
             if len(autocorr) > 1:
                 autocorr = autocorr / (autocorr[0] + 1e-8)
                 # Look for strong periodic peaks (skip first 10% to avoid lag-0 bleed)
@@ -632,8 +1126,9 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
     # --- Evidence 4: Multiple onsets (required for loops) ---
     # A loop must contain multiple distinct rhythmic events
     try:
-        onsets = safe_onset_detect(y=y, sr=sr, units='frames', hop_length=512)
-        n_onsets = len(onsets)
+        if onset_frames is None:
+            onset_frames = safe_onset_detect(y=y, sr=sr, onset_envelope=onset_env, units='frames', hop_length=512)
+        n_onsets = len(onset_frames)
         if n_onsets <= 1:
             os_score += 2.0  # Single onset = definitively one-shot
         elif n_onsets >= 4 and duration > 2.0:
@@ -658,8 +1153,8 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
     if is_percussion_sample and filename:
         fname_lower = filename.lower()
         # Check if filename suggests it's intentionally a loop
-        has_loop_hint = any(kw in fname_lower for kw in loop_keywords)
-        has_bpm_hint = bool(re.search(r'\d+\s*bpm', fname_lower))
+        has_loop_hint = _LOOP_KEYWORD_RE.search(fname_lower) is not None
+        has_bpm_hint = _BPM_HINT_RE.search(fname_lower) is not None
 
         if not (has_loop_hint or has_bpm_hint):
             # Percussion with NO loop hints -> require overwhelming evidence for loop
@@ -687,43 +1182,102 @@ def detect_sample_type(y, sr, duration, filename=None, instrument_predictions=No
     return (is_one_shot, is_loop, confidence)
 
 
-def count_onsets(y, sr):
+def count_onsets(y, sr, onset_env=None, onset_frames=None):
     """Count number of onsets in audio"""
     try:
-        onsets = safe_onset_detect(y=y, sr=sr, units='frames', hop_length=512)
-        return len(onsets)
+        if onset_frames is None:
+            onset_frames = safe_onset_detect(y=y, sr=sr, onset_envelope=onset_env, units='frames', hop_length=512)
+        return len(onset_frames)
     except:
         return 0
 
 
-def extract_tempo_features(y, sr):
+_madmom_processors = None
+_madmom_checked = False
+
+
+def load_madmom_processors():
+    """
+    Load madmom's RNN beat activation, tempo estimation and DBN beat tracking
+    processors (cached globally).
+    Returns (beat_processor, tempo_processor, beat_tracker) or None when
+    AUDIO_ANALYSIS_USE_MADMOM is off or madmom is not installed.
+    """
+    global _madmom_processors, _madmom_checked
+
+    if _madmom_checked:
+        return _madmom_processors
+    _madmom_checked = True
+
+    if not USE_MADMOM:
+        return None
+
+    try:
+        from madmom.features.beats import RNNBeatProcessor, DBNBeatTrackingProcessor
+        from madmom.features.tempo import TempoEstimationProcessor
+    except ImportError as e:
+        debug_log(f"madmom not available, tempo falls back to Essentia/Librosa: {e}")
+        return None
+
+    try:
+        load_start = time.time()
+        _madmom_processors = (
+            RNNBeatProcessor(),
+            TempoEstimationProcessor(fps=100),
+            DBNBeatTrackingProcessor(fps=100),
+        )
+        debug_log(f"madmom beat/tempo processors loaded [{(time.time()-load_start)*1000:.0f}ms]")
+    except Exception as e:
+        print(f"Warning: Failed to load madmom processors: {e}", file=sys.stderr)
+        _madmom_processors = None
+    return _madmom_processors
+
+
+def extract_tempo_features(y, sr, onset_env=None):
     """
-    Extract tempo/BPM using Essentia if available, fallback to Librosa
+    Extract tempo/BPM using madmom's RNN tempo estimator when enabled
+    (AUDIO_ANALYSIS_USE_MADMOM), else Essentia if available, fallback to Librosa
+    onset_env: Pre-calculated onset strength envelope for the Librosa fallback (optional)
     """
+    processors = load_madmom_processors()
+    if processors is not None:
+        try:
+            from madmom.audio.signal import Signal
+            beat_processor, tempo_processor, beat_tracker = processors
+            activations = beat_processor(Signal(y, sample_rate=sr, num_channels=1))
+            tempi = tempo_processor(activations)
+            if len(tempi) > 0 and tempi[0][0] > 0:
+                beats = beat_tracker(activations)
+                return {
+                    'bpm': float(tempi[0][0]),
+                    'beats_count': int(len(beats)) if len(beats) > 0 else None,
+                }
+        except Exception as e:
+            debug_log(f"madmom tempo estimation failed, falling back: {e}")
+
     try:
         if essentia is not None:
             # Use Essentia's more accurate tempo extraction
-            rhythm_extractor = es.RhythmExtractor2013(method="multifeature")
+            rhythm_extractor = essentia_algorithm('RhythmExtractor2013', method="multifeature")
             bpm, beats, beats_confidence, _, beats_intervals = rhythm_extractor(
-                y.astype('float32')
+                np.ascontiguousarray(y, dtype=np.float32)
             )
             return {
                 'bpm': float(bpm) if bpm > 0 else None,
                 'beats_count': int(len(beats)) if len(beats) > 0 else None,
             }
     except:
-        pass
+        mark_stage_degraded('tempo')
 
     # Fallback to Librosa
     try:
         # Estimate tempo from onset strength
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-
-        # Get autocorrelation for tempo estimation
-        tempogram = librosa.feature.tempogram(onset_envelope=onset_env, sr=sr)
+        if onset_env is None:
+            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
 
-        # Find the most likely tempo
-        if tempogram.shape[1] > 0:
+        # Find the most likely tempo (librosa.feature.tempo builds its own
+        # autocorrelation tempogram from the envelope)
+        if len(onset_env) > 0:
             tempo = librosa.feature.tempo(onset_envelope=onset_env, sr=sr)[0]
             return {
                 'bpm': float(tempo) if tempo > 0 else None,
@@ -735,25 +1289,48 @@ def extract_tempo_features(y, sr):
     return {'bpm': None, 'beats_count': None}
 
 
-def extract_spectral_features(y, sr, level='advanced'):
-    """Extract spectral characteristics"""
+def extract_spectral_features(y, sr, level='advanced', S=None, mel_db=None):
+    """
+    Extract spectral characteristics
+    S: Pre-calculated magnitude STFT (n_fft=2048, hop_length=512) (optional)
+    mel_db: Pre-calculated 128-band log-power mel spectrogram of S (optional)
+    """
+    # Magnitude STFT computed once and shared by every spectral feature below
+    # (librosa defaults: n_fft=2048, hop_length=512, hann window, centered).
+    # The FFT is offloaded to CUDA when AUDIO_ANALYSIS_USE_GPU is set; the mel
+    # projection and DCT are small matrix products and stay on the CPU.
+    if S is None:
+        S = np.abs(compute_stft(y))
+    S_power = S ** 2
+
+    # Per-frame spectral distribution, normalized once and shared by centroid and
+    # bandwidth (same as librosa: near-silent frames are left unnormalized)
+    # Bin frequencies in float32 so the (bins x frames) deviation matrix stays single precision
+    freqs = librosa.fft_frequencies(sr=sr, n_fft=2 * (S.shape[0] - 1)).astype(np.float32)
+    frame_total = S.sum(axis=0)
+    frame_total[frame_total < np.finfo(S.dtype).tiny] = 1.0
+    S_norm = S / frame_total
+
     # Spectral centroid - brightness indicator
-    centroid = librosa.feature.spectral_centroid(y=y, sr=sr)
+    centroid = freqs @ S_norm
 
     # Spectral rolloff - frequency below which 85% of energy is concentrated
-    rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr, roll_percent=0.85)
+    rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr, roll_percent=0.85)
 
-    # Spectral bandwidth - width of spectrum
-    bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)
+    # Spectral bandwidth - width of spectrum (2nd order, around the centroid)
+    bandwidth = np.sqrt(np.sum(S_norm * (freqs[:, np.newaxis] - centroid) ** 2, axis=0))
 
     # Spectral contrast - difference between peaks and valleys
-    contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
+    contrast = librosa.feature.spectral_contrast(S=S, sr=sr)
 
     # Zero crossing rate - texture/noisiness
-    zcr = librosa.feature.zero_crossing_rate(y)
+    zcr = frame_zcr(y)
 
     # MFCC - timbral texture (Mel-Frequency Cepstral Coefficients)
-    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    # Same as mfcc(y=...): 128-band power mel spectrogram -> dB -> DCT
+    if mel_db is None:
+        mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=S_power, sr=sr))
+    mfcc = librosa.feature.mfcc(S=mel_db, n_mfcc=13)
 
     result = {
         'spectral_centroid': float(np.mean(centroid)),
@@ -761,35 +1338,43 @@ def extract_spectral_features(y, sr, level='advanced'):
         'spectral_bandwidth': float(np.mean(bandwidth)),
         'spectral_contrast': float(np.mean(contrast)),
         'zero_crossing_rate': float(np.mean(zcr)),
-        'mfcc_mean': [float(x) for x in np.mean(mfcc, axis=1)],
+        'mfcc_mean': np.mean(mfcc, axis=1, dtype=np.float64).round(4).tolist(),
     }
 
     # Advanced level: Add mel bands statistics
     if level == 'advanced':
-        mel_spec = librosa.feature.melspectrogram(y=y, sr=sr, n_mels=40)
+        mel_spec = librosa.feature.melspectrogram(S=S_power, sr=sr, n_mels=40)
         mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
-        result['mel_bands_mean'] = [float(x) for x in np.mean(mel_spec_db, axis=1)]
-        result['mel_bands_std'] = [float(x) for x in np.std(mel_spec_db, axis=1)]
+        mel_mean = np.mean(mel_spec_db, axis=1)
+        mel_std = np.std(mel_spec_db, axis=1)
+        # Per-band lists are rounded to 4 decimals and converted in one C-level pass
+        result['mel_bands_mean'] = mel_mean.astype(np.float64).round(4).tolist()
+        result['mel_bands_std'] = mel_std.astype(np.float64).round(4).tolist()
 
     return result
 
 
-def extract_energy_features(y, sr):
+def extract_energy_features(y, sr, onset_env=None, rms=None):
     """Extract dynamics and energy envelope"""
     # RMS energy
-    rms = librosa.feature.rms(y=y)
+    if rms is None:
+        rms = frame_rms(y)
     rms_mean = float(np.mean(rms))
 
     # Loudness (LUFS-style approximation using dB scale)
-    rms_db = librosa.amplitude_to_db(rms, ref=np.max)
+    # Same as amplitude_to_db(rms, ref=np.max) (amin 1e-5, top_db 80) in a single
+    # log pass, without librosa's intermediate arrays
+    rms_db = 20.0 * np.log10(np.maximum(rms, 1e-5) / max(float(np.max(rms)), 1e-5))
+    np.maximum(rms_db, -80.0, out=rms_db)
     loudness_mean = float(np.mean(rms_db))
 
     # Dynamic range
-    dynamic_range = float(np.max(rms_db) - np.min(rms_db))
+    dynamic_range = float(np.ptp(rms_db))
 
     # Onset strength (punchiness indicator)
     try:
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        if onset_env is None:
+            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
         onset_strength = float(np.mean(onset_env))
     except:
         onset_strength = 0.0
@@ -810,8 +1395,8 @@ def extract_key_features(y, sr):
     try:
         if essentia is not None:
             # Use Essentia's KeyExtractor for accurate key detection
-            key_extractor = es.KeyExtractor()
-            key, scale, strength = key_extractor(y.astype('float32'))
+            key_extractor = essentia_algorithm('KeyExtractor')
+            key, scale, strength = key_extractor(np.ascontiguousarray(y, dtype=np.float32))
 
             # Format key estimate as "Key Scale" (e.g., "C major", "A minor")
             key_estimate = f"{key} {scale}" if key and scale else None
@@ -824,18 +1409,21 @@ def extract_key_features(y, sr):
     except Exception as e:
         # Silently handle errors - key detection is optional
         print(f"Warning: Key detection failed: {e}", file=sys.stderr)
+        mark_stage_degraded('key')
 
     return {'key_estimate': None, 'scale': None, 'key_strength': None}
 
 
-def estimate_polyphony(y, sr):
+def estimate_polyphony(y, sr, y_harmonic=None):
     """
     Approximate polyphony by counting strong harmonic peaks per frame.
+    y_harmonic: Pre-calculated harmonic component from HPSS (optional)
     Returns an integer estimate (1..8) or None when unavailable.
     """
     try:
         # Focus on harmonic content for a more stable pitch peak count.
-        y_harmonic = librosa.effects.harmonic(y)
+        if y_harmonic is None:
+            y_harmonic = librosa.effects.harmonic(y)
         stft = np.abs(librosa.stft(y_harmonic, n_fft=4096, hop_length=1024))
         if stft.size == 0 or stft.shape[1] == 0:
             return None
@@ -889,18 +1477,16 @@ def extract_timbral_features(y, sr):
 
     try:
         if essentia is not None:
-            # Convert to float32 for Essentia
-            audio_essentia = y.astype('float32')
+            # Essentia needs contiguous float32 (no copy when y already is)
+            audio_essentia = np.ascontiguousarray(y, dtype=np.float32)
 
             # Set up Essentia processing chain for spectral analysis
-            w = es.Windowing(type='hann')
-            spectrum = es.Spectrum()
-            spectral_peaks = es.SpectralPeaks()
+            spectral_peaks = essentia_algorithm('SpectralPeaks')
 
-            # Initialize extractors ONCE outside the loop
-            dissonance_extractor = es.Dissonance()
-            inharmonicity_extractor = es.Inharmonicity()
-            tristimulus_extractor = es.Tristimulus()
+            # Extractors are constructed once per process, outside the loop
+            dissonance_extractor = essentia_algorithm('Dissonance')
+            inharmonicity_extractor = essentia_algorithm('Inharmonicity')
+            tristimulus_extractor = essentia_algorithm('Tristimulus')
 
             # Process in frames to get average values
             # OPTIMIZED: Single loop for all three features instead of 3 separate loops
@@ -911,52 +1497,62 @@ def extract_timbral_features(y, sr):
             inharmonicity_values = []
             t1_values, t2_values, t3_values = [], [], []
             crest_values = []
-            crest = es.Crest()
 
-            num_frames = (len(audio_essentia) - frame_size) // hop_size
+            # Same frames as range(0, len(audio) - frame_size, hop_size)
+            num_frames = len(range(0, len(audio_essentia) - frame_size, hop_size))
             debug_log(f"  Processing {num_frames} frames for timbral features...")
             frame_start = time.time()
 
             try:
-                # Single pass through frames - extract all features at once
-                for i in range(0, len(audio_essentia) - frame_size, hop_size):
-                    frame = audio_essentia[i:i + frame_size]
-                    windowed = w(frame)
-                    spec = spectrum(windowed)
-                    freqs, mags = spectral_peaks(spec)
-
-                    if len(freqs) > 0:
-                        # Dissonance - harmonic dissonance
-                        try:
-                            diss = dissonance_extractor(freqs, mags)
-                            dissonance_values.append(diss)
-                        except:
-                            pass
-
-                        # Inharmonicity - deviation from perfect harmonic structure
-                        # Note: Only works for pitched sounds with clear fundamental frequency
-                        try:
-                            inharm = inharmonicity_extractor(freqs, mags)
-                            if inharm > 0:  # Valid result
-                                inharmonicity_values.append(inharm)
-                        except:
-                            # Skip frames without clear fundamental frequency
-                            pass
-
-                        # Tristimulus - 3-value tonal color descriptor
-                        try:
-                            t1, t2, t3 = tristimulus_extractor(freqs, mags)
-                            t1_values.append(t1)
-                            t2_values.append(t2)
-                            t3_values.append(t3)
-                        except:
-                            pass
-
-                    # Spectral Crest (computed for every frame, no freqs/mags dependency)
-                    try:
-                        crest_values.append(crest(spec))
-                    except:
-                        pass
+                # Window + magnitude spectrum for a block of frames at once, matching
+                # es.Windowing(type='hann') (symmetric hann scaled to sum 2) followed
+                # by es.Spectrum(); only the peak-based descriptors stay per frame
+                window = np.hanning(frame_size).astype(np.float32)
+                window *= 2.0 / np.sum(window)
+                fft = librosa.get_fftlib()
+                if num_frames > 0:
+                    frames = np.lib.stride_tricks.sliding_window_view(
+                        audio_essentia, frame_size
+                    )[::hop_size][:num_frames]
+
+                for block_start in range(0, num_frames, TIMBRAL_BLOCK_FRAMES):
+                    block = frames[block_start:block_start + TIMBRAL_BLOCK_FRAMES] * window
+                    block_spec = np.abs(fft.rfft(block, axis=1)).astype(np.float32)
+
+                    # Spectral Crest (every frame, no freqs/mags dependency): max / mean
+                    spec_mean = block_spec.mean(axis=1)
+                    nonzero = spec_mean > 0
+                    crest_values.extend(block_spec.max(axis=1)[nonzero] / spec_mean[nonzero])
+
+                    for spec in block_spec:
+                        freqs, mags = spectral_peaks(spec)
+
+                        if len(freqs) > 0:
+                            # Dissonance - harmonic dissonance
+                            try:
+                                diss = dissonance_extractor(freqs, mags)
+                                dissonance_values.append(diss)
+                            except:
+                                pass
+
+                            # Inharmonicity - deviation from perfect harmonic structure
+                            # Note: Only works for pitched sounds with clear fundamental frequency
+                            try:
+                                inharm = inharmonicity_extractor(freqs, mags)
+                                if inharm > 0:  # Valid result
+                                    inharmonicity_values.append(inharm)
+                            except:
+                                # Skip frames without clear fundamental frequency
+                                pass
+
+                            # Tristimulus - 3-value tonal color descriptor
+                            try:
+                                t1, t2, t3 = tristimulus_extractor(freqs, mags)
+                                t1_values.append(t1)
+                                t2_values.append(t2)
+                                t3_values.append(t3)
+                            except:
+                                pass
 
                 # Aggregate results
                 debug_log(f"  Frame processing complete [{(time.time()-frame_start)*1000:.0f}ms] - dissonance:{len(dissonance_values)}, inharm:{len(inharmonicity_values)}, tristim:{len(t1_values)}")
@@ -973,6 +1569,7 @@ def extract_timbral_features(y, sr):
             except Exception as e:
                 debug_log(f"  Timbral feature extraction failed: {e}")
                 print(f"Warning: Timbral feature extraction failed: {e}", file=sys.stderr)
+                mark_stage_degraded('timbral')
                 features['dissonance'] = None
                 features['inharmonicity'] = None
                 features['tristimulus'] = None
@@ -980,11 +1577,12 @@ def extract_timbral_features(y, sr):
 
             # Spectral Complexity (still inside "if essentia is not None" block)
             try:
-                complexity_extractor = es.SpectralComplexity()
+                complexity_extractor = essentia_algorithm('SpectralComplexity')
                 complexity = complexity_extractor(audio_essentia)
                 features['spectral_complexity'] = float(complexity)
             except:
                 features['spectral_complexity'] = None
+                mark_stage_degraded('timbral')
 
         else:
             # Essentia not available - set all to None
@@ -997,6 +1595,7 @@ def extract_timbral_features(y, sr):
     except Exception as e:
         # If Essentia fails entirely, return None for all
         print(f"Warning: Timbral feature extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('timbral')
         features = {
             'dissonance': None,
             'inharmonicity': None,
@@ -1015,25 +1614,28 @@ def extract_perceptual_features(spectral_features, energy_features, timbral_feat
     """
     features = {}
 
-    # Brightness - normalized spectral centroid
-    # Typical range: 500-8000 Hz
     centroid = spectral_features['spectral_centroid']
-    features['brightness'] = min(max((centroid - 500) / 7500, 0.0), 1.0)
+    rolloff = spectral_features['spectral_rolloff']
+    rms = energy_features['rms_energy']
+
+    # Normalize the raw inputs against their typical ranges and clamp to 0-1 in one pass:
+    #   centroid 500-8000 Hz (brightness), rolloff 1000-12000 Hz,
+    #   RMS 0.01-0.3, centroid 2000-8000 Hz (sharpness)
+    brightness, rolloff_norm, rms_norm, sharpness = np.clip(
+        [(centroid - 500) / 7500, (rolloff - 1000) / 11000, rms / 0.3, (centroid - 2000) / 6000],
+        0.0, 1.0
+    ).tolist()
+
+    # Brightness - normalized spectral centroid
+    features['brightness'] = brightness
 
     # Warmth - inverse of brightness, emphasizes low-frequency content
-    # Based on spectral rolloff
-    rolloff = spectral_features['spectral_rolloff']
-    # Typical rolloff: 1000-12000 Hz
-    # Lower rolloff = warmer sound
-    warmth_raw = 1.0 - min(max((rolloff - 1000) / 11000, 0.0), 1.0)
-    features['warmth'] = warmth_raw
+    # Based on spectral rolloff: lower rolloff = warmer sound
+    features['warmth'] = 1.0 - rolloff_norm
 
     # Hardness - combination of attack (RMS energy) and brightness
     # High energy + high brightness = hard sound
-    rms = energy_features['rms_energy']
-    # Normalize RMS (typical: 0.01-0.3)
-    rms_norm = min(max(rms / 0.3, 0.0), 1.0)
-    features['hardness'] = (features['brightness'] * 0.6 + rms_norm * 0.4)
+    features['hardness'] = (brightness * 0.6 + rms_norm * 0.4)
 
     # Roughness - based on dissonance if available, otherwise zero crossing rate
     if timbral_features.get('dissonance') is not None:
@@ -1048,15 +1650,18 @@ def extract_perceptual_features(spectral_features, energy_features, timbral_feat
     # Sharpness - spectral centroid weighted towards high frequencies
     # Similar to brightness but more extreme
     # High centroid = sharp sound
-    features['sharpness'] = min(max((centroid - 2000) / 6000, 0.0), 1.0)
+    features['sharpness'] = sharpness
 
     return features
 
 
-def extract_stereo_features(audio_path, sr):
+def extract_stereo_features(y_stereo, sr):
     """
     Extract stereo analysis features (Phase 2)
-    Loads audio in stereo to analyze L/R characteristics
+    Analyzes L/R characteristics of the channels decoded by load_audio
+    Args:
+        y_stereo: (2, n) left/right channels, or None for mono files
+        sr: Sample rate
     Returns dict with stereo_width, panning_center, stereo_imbalance
     """
     features = {
@@ -1066,29 +1671,35 @@ def extract_stereo_features(audio_path, sr):
     }
 
     try:
-        # Load audio in STEREO (mono=False)
-        y_stereo, _ = librosa.load(audio_path, sr=sr, mono=False)
-
         # If file is mono, return None for all stereo features
-        if y_stereo.ndim == 1:
+        if y_stereo is None:
             return features
 
         # Extract left and right channels
         left = y_stereo[0]
         right = y_stereo[1]
 
+        # Channel energies (reused by the panning below), accumulated in float64
+        left_centered = left.astype(np.float64)
+        right_centered = right.astype(np.float64)
+        left_energy = float(np.dot(left_centered, left_centered))
+        right_energy = float(np.dot(right_centered, right_centered))
+
         # Stereo Width: Based on L/R correlation
         # 1 - |correlation| gives width (0 = mono, 1 = wide)
-        correlation = np.corrcoef(left, right)[0, 1]
-        if not np.isnan(correlation):
+        # Pearson from dot products of the centred float64 channels (centring
+        # first avoids the cancellation of energy - n * mean**2 under DC offset)
+        left_centered -= left_centered.mean()
+        right_centered -= right_centered.mean()
+        var_product = float(np.dot(left_centered, left_centered)) * float(np.dot(right_centered, right_centered))
+        if var_product > 0:
+            correlation = float(np.dot(left_centered, right_centered)) / np.sqrt(var_product)
             features['stereo_width'] = float(1.0 - abs(correlation))
         else:
             features['stereo_width'] = 0.0
 
         # Panning Center: Dominant panning position
         # 0 = left, 0.5 = center, 1 = right
-        left_energy = np.sum(left ** 2)
-        right_energy = np.sum(right ** 2)
         total_energy = left_energy + right_energy
 
         if total_energy > 0:
@@ -1107,14 +1718,16 @@ def extract_stereo_features(audio_path, sr):
 
     except Exception as e:
         print(f"Warning: Stereo feature extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('stereo')
 
     return features
 
 
-def extract_hpss_features(y, sr):
+def extract_hpss_features(y, sr, y_harmonic=None, y_percussive=None):
     """
     Extract Harmonic/Percussive Separation features (Phase 2)
-    Uses librosa.effects.hpss() to separate components and analyze each
+    Uses librosa.effects.hpss() to separate components and analyze each,
+    unless both components are passed in pre-calculated
     Returns (features_dict, y_percussive) tuple
     """
     features = {
@@ -1128,12 +1741,13 @@ def extract_hpss_features(y, sr):
 
     try:
         # Separate harmonic and percussive components
-        y_harmonic, y_percussive = librosa.effects.hpss(y)
+        if y_harmonic is None or y_percussive is None:
+            y_harmonic, y_percussive = librosa.effects.hpss(y)
         y_percussive_out = y_percussive
 
-        # Calculate energies
-        harmonic_energy = float(np.sum(y_harmonic ** 2))
-        percussive_energy = float(np.sum(y_percussive ** 2))
+        # Calculate energies (dot products, no squared temporaries)
+        harmonic_energy = float(np.dot(y_harmonic, y_harmonic))
+        percussive_energy = float(np.dot(y_percussive, y_percussive))
 
         features['harmonic_energy'] = harmonic_energy
         features['percussive_energy'] = percussive_energy
@@ -1159,11 +1773,20 @@ def extract_hpss_features(y, sr):
 
     except Exception as e:
         print(f"Warning: HPSS feature extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('hpss')
 
     return features, y_percussive_out
 
 
-def extract_rhythm_features(y, sr, duration, tempo_features):
+# BPM -> danceability score as a piecewise-linear lookup (optimal dance tempo: 100-140 BPM).
+# Segment k covers [edge[k-1], edge[k]) and scores slope[k] * bpm + offset[k]:
+#   <80: bpm / 80 | 80-100: 0.5 -> 1.0 | 100-140: 1.0 | 140-180: 1.0 -> 0.5 | >180: decreasing to 0
+_DANCE_BPM_EDGES = np.array([80.0, 100.0, 140.0, 180.0])
+_DANCE_BPM_SLOPES = np.array([1 / 80, 1 / 40, 0.0, -1 / 80, -1 / 180])
+_DANCE_BPM_OFFSETS = np.array([0.0, -1.5, 1.0, 2.75, 1.5])
+
+
+def extract_rhythm_features(y, sr, duration, tempo_features, onset_env=None, onset_frames=None):
     """
     Extract advanced rhythm features (Phase 3)
     Args:
@@ -1171,6 +1794,8 @@ def extract_rhythm_features(y, sr, duration, tempo_features):
         sr: Sample rate
         duration: Duration in seconds
         tempo_features: Dict with 'bpm' and 'beats_count' from extract_tempo_features
+        onset_env: Pre-calculated onset strength envelope (optional)
+        onset_frames: Pre-calculated onset frames (optional)
     Returns dict with onset_rate, beat_strength, rhythmic_regularity, danceability
     """
     features = {
@@ -1182,7 +1807,10 @@ def extract_rhythm_features(y, sr, duration, tempo_features):
 
     try:
         # Detect onsets
-        onset_frames = safe_onset_detect(y=y, sr=sr, units='frames', hop_length=512)
+        if onset_env is None:
+            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        if onset_frames is None:
+            onset_frames = safe_onset_detect(y=y, sr=sr, onset_envelope=onset_env, units='frames', hop_length=512)
         onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=512)
 
         # Onset Rate: Onsets per second
@@ -1193,7 +1821,6 @@ def extract_rhythm_features(y, sr, duration, tempo_features):
 
         # Beat Strength: Onset envelope strength
         try:
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
             features['beat_strength'] = float(np.mean(onset_env))
         except:
             features['beat_strength'] = 0.0
@@ -1217,18 +1844,9 @@ def extract_rhythm_features(y, sr, duration, tempo_features):
         # Only calculate for samples with detected tempo
         bpm = tempo_features.get('bpm')
         if bpm is not None and bpm > 0:
-            # Normalize BPM to 0-1 range (optimal dance tempo: 100-140 BPM)
-            bpm_score = 0.0
-            if 100 <= bpm <= 140:
-                bpm_score = 1.0  # Optimal range
-            elif 80 <= bpm < 100:
-                bpm_score = 0.5 + (bpm - 80) / 40  # 0.5 to 1.0
-            elif 140 < bpm <= 180:
-                bpm_score = 1.0 - (bpm - 140) / 80  # 1.0 to 0.5
-            elif bpm < 80:
-                bpm_score = bpm / 80  # 0 to 0.5
-            else:
-                bpm_score = max(0.0, 0.5 - (bpm - 180) / 180)  # Decreasing after 180
+            # Normalize BPM to 0-1 range via the breakpoint table (optimal dance tempo: 100-140 BPM)
+            segment = int(np.searchsorted(_DANCE_BPM_EDGES, bpm, side='right'))
+            bpm_score = max(0.0, float(_DANCE_BPM_SLOPES[segment] * bpm + _DANCE_BPM_OFFSETS[segment]))
 
             # Normalize beat strength (typical range: 0-3.0)
             beat_strength_score = min(features['beat_strength'] / 3.0, 1.0) if features['beat_strength'] else 0.0
@@ -1245,17 +1863,19 @@ def extract_rhythm_features(y, sr, duration, tempo_features):
 
     except Exception as e:
         print(f"Warning: Rhythm feature extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('rhythm')
 
     return features
 
 
-def extract_adsr_envelope(y, sr):
+def extract_adsr_envelope(y, sr, rms=None):
     """
     Extract ADSR envelope features (Phase 3)
     Analyzes the RMS envelope to extract attack, decay, sustain, release times
     Args:
         y: Audio time series
         sr: Sample rate
+        rms: Pre-calculated RMS envelope, frame 2048 / hop 512 (optional)
     Returns dict with attack_time, decay_time, sustain_level, release_time, envelope_type
     """
     features = {
@@ -1268,13 +1888,13 @@ def extract_adsr_envelope(y, sr):
 
     try:
         # Calculate RMS envelope
-        rms = librosa.feature.rms(y=y, frame_length=2048, hop_length=512)[0]
+        if rms is None:
+            rms = frame_rms(y, frame_length=2048, hop_length=512)
 
         if len(rms) < 10:
             return features  # Too short to analyze
 
         # Smooth the envelope
-        from scipy.ndimage import gaussian_filter1d
         rms_smooth = gaussian_filter1d(rms, sigma=2)
 
         # Find peak
@@ -1291,11 +1911,7 @@ def extract_adsr_envelope(y, sr):
         # Attack Time: Time from start to peak
         # Find where envelope crosses 10% of peak
         attack_threshold = peak_value * 0.1
-        attack_start_idx = 0
-        for i in range(peak_idx):
-            if rms_smooth[i] >= attack_threshold:
-                attack_start_idx = i
-                break
+        attack_start_idx = first_true(rms_smooth[:peak_idx] >= attack_threshold, 0)
 
         features['attack_time'] = float(frame_to_time(peak_idx - attack_start_idx))
 
@@ -1317,23 +1933,17 @@ def extract_adsr_envelope(y, sr):
 
             # Find decay time: time from peak to sustain level
             decay_threshold = peak_value - (peak_value - sustain_level) * 0.8
-            decay_end_idx = peak_idx
-            for i in range(peak_idx, len(rms_smooth)):
-                if rms_smooth[i] <= decay_threshold:
-                    decay_end_idx = i
-                    break
+            decay_end_idx = peak_idx + first_true(tail <= decay_threshold, 0)
 
             features['decay_time'] = float(frame_to_time(decay_end_idx - peak_idx))
 
             # Release Time: Time from sustain to 10% of peak
             release_threshold = peak_value * 0.1
             release_start_idx = decay_end_idx
-            release_end_idx = len(rms_smooth) - 1
-
-            for i in range(decay_end_idx, len(rms_smooth)):
-                if rms_smooth[i] <= release_threshold:
-                    release_end_idx = i
-                    break
+            release_end_idx = decay_end_idx + first_true(
+                rms_smooth[decay_end_idx:] <= release_threshold,
+                len(rms_smooth) - 1 - decay_end_idx,
+            )
 
             features['release_time'] = float(frame_to_time(release_end_idx - release_start_idx))
         else:
@@ -1368,6 +1978,7 @@ def extract_adsr_envelope(y, sr):
 
     except Exception as e:
         print(f"Warning: ADSR envelope extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('adsr')
 
     return features
 
@@ -1377,13 +1988,13 @@ def load_yamnet_model():
     Load YAMNet model from TensorFlow Hub (cached globally)
     Returns: (model, class_names)
     """
-    global _yamnet_model, _yamnet_class_names
+    global _yamnet_model, _yamnet_class_names, _yamnet_instrument_mask
 
     if _yamnet_model is not None:
         debug_log("YAMNet model already cached")
         return _yamnet_model, _yamnet_class_names
 
-    if tf is None or hub is None:
+    if load_tensorflow() is None:
         debug_log("TensorFlow/Hub not available, skipping YAMNet")
         return None, None
 
@@ -1412,6 +2023,7 @@ def load_yamnet_model():
                 if '/m/' in name or name.isdigit():
                     name = f"unknown_class_{len(_yamnet_class_names)}"
                 _yamnet_class_names.append(name)
+        _yamnet_instrument_mask = yamnet_instrument_mask(_yamnet_class_names)
 
         print(f"YAMNet model loaded successfully ({len(_yamnet_class_names)} classes)", file=sys.stderr)
         debug_log(f"YAMNet total load time: {(time.time()-load_start)*1000:.0f}ms")
@@ -1419,9 +2031,54 @@ def load_yamnet_model():
     except Exception as e:
         debug_log(f"YAMNet loading failed: {e}")
         print(f"Warning: Failed to load YAMNet model: {e}", file=sys.stderr)
+        mark_stage_degraded('yamnet')
         return None, None
 
 
+# Generic/useless YAMNet classes that don't help identify instruments
+_YAMNET_BLOCKLIST = frozenset({
+    'music', 'singing', 'song', 'speech', 'tender music', 'sad music',
+    'happy music', 'music of asia', 'music of africa', 'music of latin america',
+    'pop music', 'rock music', 'hip hop music', 'electronic music',
+    'christian music', 'wedding music', 'new-age music', 'independent music',
+    'theme music', 'background music', 'video game music', 'christmas music',
+    'dance music', 'soul music', 'gospel music', 'disco', 'funk',
+    'musical instrument', 'plucked string instrument', 'bowed string instrument',
+    'wind instrument, woodwind instrument', 'sound effect', 'noise',
+    'inside, small room', 'outside, urban or manmade', 'outside, rural or natural',
+    'silence', 'white noise', 'pink noise', 'static',
+})
+
+# YAMNet class categories we care about (actual instruments/sounds), matched as
+# substrings of the class name with one precompiled alternation
+_YAMNET_INSTRUMENT_RE = re.compile('|'.join(map(re.escape, [
+    'guitar', 'drum', 'bass', 'piano', 'keyboard', 'synth',
+    'violin', 'brass', 'trumpet', 'saxophone', 'flute', 'organ',
+    'percussion', 'cymbal',
+    'snare', 'kick', 'hi-hat', 'tom', 'clap', 'cowbell', 'shaker',
+    'tambourine', 'bell', 'chime', 'pluck', 'strum', 'string',
+    'marimba', 'xylophone', 'harmonica', 'harp', 'ukulele', 'banjo',
+    'cello', 'viola', 'trombone', 'tuba', 'clarinet', 'oboe',
+    'bass drum', 'gong', 'tabla', 'bongo', 'conga', 'woodblock',
+    'glockenspiel', 'vibraphone', 'steelpan', 'accordion',
+    'synthesizer', 'electric piano', 'drum kit', 'drum machine',
+])), re.IGNORECASE)
+
+
+def yamnet_instrument_mask(class_names):
+    """
+    Boolean mask over the YAMNet classes usable as instrument predictions:
+    instrument-related, not blocklisted and not a leaked AudioSet ontology ID.
+    The class list is fixed, so this is computed once when the model is loaded.
+    """
+    return np.array([
+        class_name.lower() not in _YAMNET_BLOCKLIST
+        and not ('/m/' in class_name or class_name.replace(' ', '').replace(',', '').isdigit())
+        and _YAMNET_INSTRUMENT_RE.search(class_name) is not None
+        for class_name in class_names
+    ], dtype=bool)
+
+
 def extract_instrument_ml(audio_path, y, sr):
     """
     Extract instrument/audio event classification using YAMNet (Phase 4)
@@ -1446,7 +2103,7 @@ def extract_instrument_ml(audio_path, y, sr):
         # YAMNet expects 16kHz mono audio
         resample_start = time.time()
         if sr != 16000:
-            y_16k = librosa.resample(y, orig_sr=sr, target_sr=16000)
+            y_16k = librosa.resample(y, orig_sr=sr, target_sr=16000, res_type='soxr_hq')
             debug_log(f"  Resampled audio to 16kHz [{(time.time()-resample_start)*1000:.0f}ms]")
         else:
             y_16k = y
@@ -1464,61 +2121,16 @@ def extract_instrument_ml(audio_path, y, sr):
         mean_scores = np.mean(scores.numpy(), axis=0)
 
         # Get top predictions
-        top_indices = np.argsort(mean_scores)[::-1][:20]  # Top 20
-
-        # Filter for instrument-related classes
-        # Blocklist: generic/useless YAMNet classes that don't help identify instruments
-        yamnet_blocklist = {
-            'music', 'singing', 'song', 'speech', 'tender music', 'sad music',
-            'happy music', 'music of asia', 'music of africa', 'music of latin america',
-            'pop music', 'rock music', 'hip hop music', 'electronic music',
-            'christian music', 'wedding music', 'new-age music', 'independent music',
-            'theme music', 'background music', 'video game music', 'christmas music',
-            'dance music', 'soul music', 'gospel music', 'disco', 'funk',
-            'musical instrument', 'plucked string instrument', 'bowed string instrument',
-            'wind instrument, woodwind instrument', 'sound effect', 'noise',
-            'inside, small room', 'outside, urban or manmade', 'outside, rural or natural',
-            'silence', 'white noise', 'pink noise', 'static',
-        }
-
-        # YAMNet class categories we care about (actual instruments/sounds)
-        instrument_keywords = [
-            'guitar', 'drum', 'bass', 'piano', 'keyboard', 'synth',
-            'violin', 'brass', 'trumpet', 'saxophone', 'flute', 'organ',
-            'percussion', 'cymbal',
-            'snare', 'kick', 'hi-hat', 'tom', 'clap', 'cowbell', 'shaker',
-            'tambourine', 'bell', 'chime', 'pluck', 'strum', 'string',
-            'marimba', 'xylophone', 'harmonica', 'harp', 'ukulele', 'banjo',
-            'cello', 'viola', 'trombone', 'tuba', 'clarinet', 'oboe',
-            'bass drum', 'gong', 'tabla', 'bongo', 'conga', 'woodblock',
-            'glockenspiel', 'vibraphone', 'steelpan', 'accordion',
-            'synthesizer', 'electric piano', 'drum kit', 'drum machine',
-        ]
+        top_indices = top_k_indices(mean_scores, 20)  # Top 20
 
         instrument_predictions = []
-        for idx in top_indices:
-            class_name = class_names[idx]
-            confidence = float(mean_scores[idx])
-            class_lower = class_name.lower()
-
-            # Skip blocklisted generic classes
-            if class_lower in yamnet_blocklist:
-                continue
-
-            # Skip entries with AudioSet ontology IDs leaking through
-            if '/m/' in class_name or class_name.replace(' ', '').replace(',', '').isdigit():
-                continue
-
-            # Check if this class is instrument-related
-            if any(keyword in class_lower for keyword in instrument_keywords):
-                instrument_predictions.append({
-                    'class': class_name,
-                    'confidence': confidence
-                })
-
-            # Limit to top 10 instrument predictions
-            if len(instrument_predictions) >= 10:
-                break
+        # Keep the instrument-related classes among the top 20 (mask precomputed at
+        # model load), limited to the top 10 instrument predictions
+        for idx in top_indices[_yamnet_instrument_mask[top_indices]][:10]:
+            instrument_predictions.append({
+                'class': class_names[idx],
+                'confidence': float(mean_scores[idx])
+            })
 
         features['instrument_classes'] = instrument_predictions
 
@@ -1528,6 +2140,7 @@ def extract_instrument_ml(audio_path, y, sr):
 
     except Exception as e:
         print(f"Warning: YAMNet inference failed: {e}", file=sys.stderr)
+        mark_stage_degraded('yamnet')
 
     return features
 
@@ -1583,9 +2196,22 @@ def load_panns_model():
     except Exception as e:
         debug_log(f"PANNs loading failed: {e}")
         print(f"Warning: Failed to load PANNs model: {e}", file=sys.stderr)
+        mark_stage_degraded('panns')
         return None, None
 
 
+# AudioSet labels kept as PANNs instrument predictions (substring match, precompiled)
+_PANNS_INSTRUMENT_RE = re.compile('|'.join(map(re.escape, [
+    'drum', 'percussion', 'bass', 'guitar', 'piano', 'keyboard', 'organ',
+    'synth', 'violin', 'cello', 'flute', 'trumpet', 'saxophone', 'horn',
+    'singing', 'vocal', 'voice', 'speech', 'rap', 'choir',
+    'clap', 'snap', 'cymbal', 'hi-hat', 'snare', 'kick',
+    'bell', 'gong', 'harmonica', 'banjo', 'ukulele', 'harp',
+    'marimba', 'xylophone', 'vibraphone', 'tambourine',
+    'sound effect', 'noise', 'explosion', 'whoosh',
+])), re.IGNORECASE)
+
+
 def extract_instrument_ml_panns(audio_path, y, sr):
     """
     Extract instrument/audio classification and embeddings using PANNs CNN14.
@@ -1606,7 +2232,7 @@ def extract_instrument_ml_panns(audio_path, y, sr):
         # PANNs expects 32kHz mono audio
         resample_start = time.time()
         if sr != 32000:
-            y_32k = librosa.resample(y, orig_sr=sr, target_sr=32000)
+            y_32k = librosa.resample(y, orig_sr=sr, target_sr=32000, res_type='soxr_hq')
             debug_log(f"  Resampled audio to 32kHz [{(time.time()-resample_start)*1000:.0f}ms]")
         else:
             y_32k = y
@@ -1624,25 +2250,13 @@ def extract_instrument_ml_panns(audio_path, y, sr):
         emb = embedding[0]
 
         # Extract top instrument predictions
-        instrument_keywords = [
-            'drum', 'percussion', 'bass', 'guitar', 'piano', 'keyboard', 'organ',
-            'synth', 'violin', 'cello', 'flute', 'trumpet', 'saxophone', 'horn',
-            'singing', 'vocal', 'voice', 'speech', 'rap', 'choir',
-            'clap', 'snap', 'cymbal', 'hi-hat', 'snare', 'kick',
-            'bell', 'gong', 'harmonica', 'banjo', 'ukulele', 'harp',
-            'marimba', 'xylophone', 'vibraphone', 'tambourine',
-            'sound effect', 'noise', 'explosion', 'whoosh',
-        ]
-
-        sorted_indices = np.argsort(predictions)[::-1]
         instrument_predictions = []
-        for idx in sorted_indices[:50]:
+        for idx in top_k_indices(predictions, 50):
             confidence = float(predictions[idx])
             if confidence < 0.05:
                 break
             class_name = labels[idx] if idx < len(labels) else f"class_{idx}"
-            class_lower = class_name.lower()
-            if any(kw in class_lower for kw in instrument_keywords):
+            if _PANNS_INSTRUMENT_RE.search(class_name):
                 instrument_predictions.append({
                     'class': class_name,
                     'confidence': confidence
@@ -1656,10 +2270,33 @@ def extract_instrument_ml_panns(audio_path, y, sr):
 
     except Exception as e:
         print(f"Warning: PANNs inference failed: {e}", file=sys.stderr)
+        mark_stage_degraded('panns')
 
     return features
 
 
+def extract_instrument_ml_auto(audio_path, y, sr):
+    """
+    ML instrument classification with the configured model: PANNs CNN14 by
+    default, YAMNet when AUDIO_ANALYSIS_USE_YAMNET is set or PANNs is unavailable
+    """
+    step_start = time.time()
+    if USE_YAMNET:
+        ml_instrument_features = extract_instrument_ml(audio_path, y, sr)
+        debug_log(f"Phase 4: YAMNet instrument classification [{(time.time()-step_start)*1000:.0f}ms]")
+        return ml_instrument_features
+
+    ml_instrument_features = extract_instrument_ml_panns(audio_path, y, sr)
+    debug_log(f"Phase 4: PANNs CNN14 instrument classification [{(time.time()-step_start)*1000:.0f}ms]")
+    # If PANNs failed (not installed), fall back to YAMNet
+    if ml_instrument_features.get('instrument_classes') is None:
+        debug_log("PANNs unavailable, falling back to YAMNet")
+        step_start = time.time()
+        ml_instrument_features = extract_instrument_ml(audio_path, y, sr)
+        debug_log(f"Phase 4: YAMNet fallback [{(time.time()-step_start)*1000:.0f}ms]")
+    return ml_instrument_features
+
+
 def extract_genre_ml(y, sr, spectral_features=None, energy_features=None, tempo_features=None, yamnet_instruments=None, hpss_ratio=None, is_one_shot=False):
     """
     Extract genre and mood classification using audio feature heuristics (Phase 4)
@@ -1694,14 +2331,14 @@ def extract_genre_ml(y, sr, spectral_features=None, energy_features=None, tempo_
         else:
             spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))
             spectral_rolloff = np.mean(librosa.feature.spectral_rolloff(y=y, sr=sr))
-            zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(y))
+            zero_crossing_rate = np.mean(frame_zcr(y))
 
         if energy_features:
             rms_mean = energy_features['rms_energy']
             loudness = energy_features['loudness']
             dynamic_range = energy_features['dynamic_range']
         else:
-            rms = librosa.feature.rms(y=y)
+            rms = frame_rms(y)
             rms_mean = np.mean(rms)
             rms_db = librosa.amplitude_to_db(rms, ref=np.max)
             loudness = np.mean(rms_db)
@@ -1867,6 +2504,7 @@ def extract_genre_ml(y, sr, spectral_features=None, energy_features=None, tempo_
 
     except Exception as e:
         print(f"Warning: Genre/mood extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('genre')
 
     return features
 
@@ -1912,17 +2550,106 @@ def extract_instrument_predictions(y, sr, spectral_features, energy_features, du
     if onset_strength > 0.4 and duration < 2.0:
         predictions.append({'name': 'percussion', 'confidence': 0.55})
 
-    # Remove duplicates and sort by confidence
-    seen = set()
-    unique_predictions = []
-    for pred in sorted(predictions, key=lambda x: x['confidence'], reverse=True):
-        if pred['name'] not in seen:
-            seen.add(pred['name'])
-            unique_predictions.append(pred)
+    # Remove duplicates (keep the most confident entry per name) and sort by confidence
+    best_by_name = {}
+    for pred in predictions:
+        current = best_by_name.get(pred['name'])
+        if current is None or pred['confidence'] > current['confidence']:
+            best_by_name[pred['name']] = pred
 
+    unique_predictions = sorted(best_by_name.values(), key=lambda x: x['confidence'], reverse=True)
     return unique_predictions[:5]  # Return top 5 predictions
 
 
+def true_peak(y, oversample=4, block_samples=1 << 20):
+    """
+    BS.1770-4 true peak (linear): max |y| after 4x polyphase oversampling, which
+    catches inter-sample peaks that the raw sample maximum misses. Processed in
+    blocks with a small overlap so the oversampled copy stays bounded on long files;
+    the overlap covers the interpolation filter, so block seams match a single pass.
+    """
+    margin = 64
+    peak = 0.0
+    for start in range(0, len(y), block_samples):
+        lo = max(0, start - margin)
+        hi = min(len(y), start + block_samples + margin)
+        upsampled = scipy.signal.resample_poly(y[lo:hi], oversample, 1)
+        keep_end = min(start + block_samples, len(y))
+        upsampled = upsampled[(start - lo) * oversample:(keep_end - lo) * oversample]
+        if upsampled.size:
+            peak = max(peak, float(np.max(np.abs(upsampled))))
+    return peak
+
+
+def bs1770_block_bounds(n_samples, sr, block_size=0.4, overlap=0.75):
+    """
+    Sample bounds [lower, upper) of the overlapping gating blocks of a signal of
+    n_samples, with the same block count and rounding as pyloudnorm's Meter.
+    The block count is rounded, so the last block can run past the end of the
+    signal; its bounds are clipped to n_samples like pyloudnorm's slicing does
+    (a partial block, still averaged over the full block length).
+    """
+    step = 1.0 - overlap
+    duration = n_samples / sr
+    num_blocks = int(np.round((duration - block_size) / (block_size * step))) + 1
+    j = np.arange(num_blocks)
+    lower = np.minimum((block_size * (j * step) * sr).astype(int), n_samples)
+    upper = np.minimum((block_size * (j * step + 1) * sr).astype(int), n_samples)
+    return lower, upper
+
+
+def bs1770_k_weighting_sos(sr):
+    """
+    ITU-R BS.1770 K-weighting (+4 dB high shelf at 1500 Hz, then 38 Hz high-pass)
+    as a second-order-sections cascade for scipy.signal.sosfilt. Same RBJ biquad
+    design and parameters as pyloudnorm's "K-weighting" filter class, built here
+    so the filter doesn't depend on pyloudnorm's private Meter internals.
+    """
+    def biquad(b, a):
+        return np.concatenate([b, a]) / a[0]
+
+    # High shelf: G = +4 dB, Q = 1/sqrt(2), fc = 1500 Hz
+    A = 10 ** (4.0 / 40.0)
+    w0 = 2.0 * np.pi * 1500.0 / sr
+    alpha = np.sin(w0) / (2.0 * (1.0 / np.sqrt(2.0)))
+    cos_w0 = np.cos(w0)
+    shelf = biquad(
+        np.array([A * ((A + 1) + (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha),
+                  -2 * A * ((A - 1) + (A + 1) * cos_w0),
+                  A * ((A + 1) + (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha)]),
+        np.array([(A + 1) - (A - 1) * cos_w0 + 2 * np.sqrt(A) * alpha,
+                  2 * ((A - 1) - (A + 1) * cos_w0),
+                  (A + 1) - (A - 1) * cos_w0 - 2 * np.sqrt(A) * alpha]),
+    )
+
+    # High-pass: Q = 0.5, fc = 38 Hz
+    w0 = 2.0 * np.pi * 38.0 / sr
+    alpha = np.sin(w0) / (2.0 * 0.5)
+    cos_w0 = np.cos(w0)
+    high_pass = biquad(
+        np.array([(1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2]),
+        np.array([1 + alpha, -2 * cos_w0, 1 - alpha]),
+    )
+    return np.array([shelf, high_pass])
+
+
+def bs1770_gated_loudness(z):
+    """
+    ITU-R BS.1770 gated loudness (LUFS) of mono block mean-square energies z,
+    reduced along the last axis: -70 LUFS absolute gate, then -10 LU relative gate.
+    Same gating as pyloudnorm.Meter.integrated_loudness, for many signals at once.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        block_loudness = -0.691 + 10.0 * np.log10(z)
+        above_absolute = block_loudness >= -70.0
+        relative_gate = -0.691 + 10.0 * np.log10(
+            np.sum(z * above_absolute, axis=-1) / np.sum(above_absolute, axis=-1)
+        ) - 10.0
+        gated = (block_loudness > relative_gate[..., np.newaxis]) & (block_loudness > -70.0)
+        z_gated = np.nan_to_num(np.sum(z * gated, axis=-1) / np.sum(gated, axis=-1))
+        return -0.691 + 10.0 * np.log10(z_gated)
+
+
 def extract_loudness_ebu(y, sr):
     """
     Extract EBU R128 loudness features using pyloudnorm (Phase 5)
@@ -1939,45 +2666,58 @@ def extract_loudness_ebu(y, sr):
         'true_peak': None,
     }
 
-    try:
-        # Import pyloudnorm
-        try:
-            import pyloudnorm as pyln
-        except ImportError:
-            print("Warning: pyloudnorm not available, skipping EBU R128 analysis", file=sys.stderr)
-            return features
+    if pyln is None:
+        print("Warning: pyloudnorm not available, skipping EBU R128 analysis", file=sys.stderr)
+        return features
 
+    try:
         # Create BS.1770 meter (EBU R128 standard)
         meter = pyln.Meter(sr)  # Creates meter with the correct sample rate
+        if len(y) < meter.block_size * sr:
+            # Shorter than one 400 ms gating block: no BS.1770 loudness (not a failure)
+            debug_log("  Audio shorter than one gating block, skipping EBU R128 analysis")
+            return features
+        # Same input checks as meter.integrated_loudness
+        pyln.util.valid_audio(y, sr, meter.block_size)
+
+        # K-weight the whole signal once (shelf + high-pass as one biquad cascade)
+        # and keep a running sum of its squares, so every 400 ms gating block, of
+        # the whole file or of any segment, is a difference of two sums
+        weighted = scipy.signal.sosfilt(bs1770_k_weighting_sos(sr), y)
+        energy = np.zeros(len(weighted) + 1)
+        np.cumsum(np.square(weighted), out=energy[1:])
+        block_samples = meter.block_size * sr
 
         # Measure integrated loudness (LUFS)
-        loudness = meter.integrated_loudness(y)
-        features['loudness_integrated'] = float(loudness)
+        lower, upper = bs1770_block_bounds(len(y), sr, meter.block_size, meter.overlap)
+        loudness = float(bs1770_gated_loudness((energy[upper] - energy[lower]) / block_samples))
+        features['loudness_integrated'] = loudness
+        if DEBUG_MODE:
+            # Cross-check the cumulative-sum path against pyloudnorm's own meter
+            reference = meter.integrated_loudness(y)
+            if not np.isclose(loudness, reference, rtol=0.0, atol=1e-3, equal_nan=True):
+                debug_log(f"  EBU R128 integrated loudness {loudness:.4f} differs from "
+                          f"pyloudnorm {reference:.4f}")
 
         # Loudness Range (LU) - requires segmented analysis
-        # Split audio into 3-second segments and measure
+        # Split audio into 3-second segments (50% overlap) and measure
         segment_length = 3.0  # seconds
         segment_samples = int(segment_length * sr)
 
         if len(y) >= segment_samples:
-            # Calculate momentary loudness for each segment
-            momentary_loudnesses = []
-            for i in range(0, len(y) - segment_samples + 1, segment_samples // 2):
-                segment = y[i:i + segment_samples]
-                try:
-                    seg_loudness = meter.integrated_loudness(segment)
-                    if not np.isnan(seg_loudness) and not np.isinf(seg_loudness):
-                        momentary_loudnesses.append(seg_loudness)
-                except:
-                    pass
-
-            if len(momentary_loudnesses) > 0:
-                # Loudness Range (LU) = difference between 95th and 10th percentile
-                momentary_array = np.array(momentary_loudnesses)
-                p95 = np.percentile(momentary_array, 95)
-                p10 = np.percentile(momentary_array, 10)
+            # Gated loudness of every segment at once: rows are segments, columns blocks
+            starts = np.arange(0, len(y) - segment_samples + 1, segment_samples // 2)[:, np.newaxis]
+            lower, upper = bs1770_block_bounds(segment_samples, sr, meter.block_size, meter.overlap)
+            segment_energy = (energy[starts + upper] - energy[starts + lower]) / block_samples
+            momentary_array = bs1770_gated_loudness(segment_energy)
+            momentary_array = momentary_array[np.isfinite(momentary_array)]
+
+            if len(momentary_array) > 0:
+                # Loudness Range (LU) = difference between 95th and 10th percentile;
+                # both quantiles and the maximum (100th) from one partial sort
+                p10, p95, momentary_max = np.percentile(momentary_array, [10, 95, 100])
                 features['loudness_range'] = float(p95 - p10)
-                features['loudness_momentary_max'] = float(np.max(momentary_array))
+                features['loudness_momentary_max'] = float(momentary_max)
             else:
                 features['loudness_range'] = 0.0
                 features['loudness_momentary_max'] = loudness
@@ -1986,10 +2726,9 @@ def extract_loudness_ebu(y, sr):
             features['loudness_range'] = 0.0
             features['loudness_momentary_max'] = loudness
 
-        # True Peak (dBTP) - maximum sample value in dB
-        # True peak detection requires oversampling to catch inter-sample peaks
-        # For simplicity, we'll use the maximum absolute sample value
-        true_peak_linear = np.max(np.abs(y))
+        # True Peak (dBTP) - maximum of the 4x oversampled signal, so inter-sample
+        # peaks between the original samples are included
+        true_peak_linear = true_peak(y)
         if true_peak_linear > 0:
             # Convert to dBTP (decibels relative to full scale)
             true_peak_db = 20 * np.log10(true_peak_linear)
@@ -1999,11 +2738,12 @@ def extract_loudness_ebu(y, sr):
 
     except Exception as e:
         print(f"Warning: EBU R128 loudness extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('loudness')
 
     return features
 
 
-def detect_sound_events(y, sr, duration):
+def detect_sound_events(y, sr, duration, rms=None):
     """
     Detect discrete sound events using superflux onset detection (Phase 5).
 
@@ -2018,6 +2758,7 @@ def detect_sound_events(y, sr, duration):
         y: Audio time series
         sr: Sample rate
         duration: Duration in seconds
+        rms: Pre-calculated RMS envelope at hop 512 (optional)
     Returns:
         dict with event_count, event_density
     """
@@ -2053,25 +2794,22 @@ def detect_sound_events(y, sr, duration):
 
         # --- RMS energy validation ---
         # Discard onsets that land in noise-floor regions (below -24 dB of peak)
-        rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+        if rms is None:
+            rms = frame_rms(y, hop_length=hop_length)
         rms_peak = np.max(rms) if len(rms) > 0 else 0.0
         noise_floor = rms_peak * 0.06  # ~-24 dB
 
         if len(onset_frames) > 0 and len(rms) > 0:
-            valid_onsets = []
-            for frame in onset_frames:
-                rms_idx = min(frame, len(rms) - 1)
-                # Check a small neighborhood (±2 frames) for local energy
-                window_start = max(0, rms_idx - 2)
-                window_end = min(len(rms), rms_idx + 3)
-                local_rms = np.max(rms[window_start:window_end])
-                if local_rms > noise_floor:
-                    valid_onsets.append(frame)
-            onset_frames = np.array(valid_onsets)
+            # Local energy: max over a small neighborhood (±2 frames, clipped at the
+            # edges) of every frame at once, then looked up per onset
+            local_rms = maximum_filter1d(rms, size=5, mode='nearest')
+            onset_frames = onset_frames[local_rms[np.minimum(onset_frames, len(rms) - 1)] > noise_floor]
 
         # --- Group nearby onsets (<100ms) into single events ---
+        # Greedy against the last kept event (not the previous onset), so a run of
+        # closely spaced onsets still yields one event per 100ms
         if len(onset_frames) > 1:
-            onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=hop_length)
+            onset_times = librosa.frames_to_time(onset_frames, sr=sr, hop_length=hop_length).tolist()
             min_event_gap = 0.1  # 100ms minimum between events
             unique_events = [onset_times[0]]
             for onset_time in onset_times[1:]:
@@ -2086,6 +2824,7 @@ def detect_sound_events(y, sr, duration):
 
     except Exception as e:
         print(f"Warning: Sound event detection failed: {e}", file=sys.stderr)
+        mark_stage_degraded('events')
 
     return features
 
@@ -2116,9 +2855,10 @@ def extract_fingerprint(audio_path, y, sr):
             features['similarity_hash'] = sha256.hexdigest()
         except Exception as e:
             print(f"Warning: Similarity hash failed: {e}", file=sys.stderr)
+            mark_stage_degraded('fingerprint')
 
         # Chromaprint fingerprint for exact/near duplicate detection
-        if acoustid is not None:
+        if load_acoustid() is not None:
             try:
                 # Use pyacoustid to generate chromaprint fingerprint
                 # acoustid.fingerprint_file returns (duration, fingerprint)
@@ -2129,17 +2869,21 @@ def extract_fingerprint(audio_path, y, sr):
                 features['chromaprint_fingerprint'] = fingerprint
             except Exception as e:
                 print(f"Warning: Chromaprint fingerprinting failed: {e}", file=sys.stderr)
+                mark_stage_degraded('fingerprint')
 
     except Exception as e:
         print(f"Warning: Fingerprint extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('fingerprint')
 
     return features
 
 
-def extract_additional_features(y, sr):
+def extract_additional_features(y, sr, rms=None, S=None):
     """
     Extract additional audio features: spectral flux, spectral flatness,
     temporal centroid, and crest factor.
+    rms: Pre-calculated RMS envelope for the temporal centroid (optional)
+    S: Pre-calculated magnitude STFT for flux and flatness (optional)
     """
     features = {
         'spectral_flux': None,
@@ -2150,32 +2894,35 @@ def extract_additional_features(y, sr):
 
     try:
         # Spectral flux: L2 norm of frame-to-frame STFT magnitude difference, mean
-        S = np.abs(librosa.stft(y))
+        if S is None:
+            S = np.abs(compute_stft(y))
         if S.shape[1] > 1:
             diff = np.diff(S, axis=1)
-            flux_per_frame = np.sqrt(np.sum(diff ** 2, axis=0))
+            flux_per_frame = np.sqrt(np.einsum('ij,ij->j', diff, diff))
             features['spectral_flux'] = float(np.mean(flux_per_frame))
 
         # Spectral flatness
-        flatness = librosa.feature.spectral_flatness(y=y)
+        flatness = librosa.feature.spectral_flatness(S=S)
         features['spectral_flatness'] = float(np.mean(flatness))
 
         # Temporal centroid: sum(t * rms(t)) / sum(rms(t)), normalized 0-1
-        rms = librosa.feature.rms(y=y)[0]
+        if rms is None:
+            rms = frame_rms(y)
         if np.sum(rms) > 1e-8:
-            t = np.arange(len(rms), dtype=np.float64)
-            temporal_centroid = np.sum(t * rms) / np.sum(rms)
+            t = np.arange(len(rms), dtype=np.float32)
+            temporal_centroid = np.dot(t, rms) / np.sum(rms)
             # Normalize to 0-1
             features['temporal_centroid'] = float(temporal_centroid / (len(rms) - 1)) if len(rms) > 1 else 0.5
 
         # Crest factor: 20 * log10(peak / rms) in dB
-        rms_total = np.sqrt(np.mean(y ** 2))
+        rms_total = np.sqrt(np.dot(y, y) / len(y))
         peak_val = np.max(np.abs(y))
         if rms_total > 1e-8:
             features['crest_factor'] = float(20.0 * np.log10(peak_val / rms_total))
 
     except Exception as e:
         print(f"Warning: Additional feature extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('additional')
 
     return features
 
@@ -2240,12 +2987,13 @@ def extract_fundamental_frequency(y, sr, filename=None, spectral_features=None):
 
     except Exception as e:
         print(f"Warning: Fundamental frequency extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('f0')
         return None
 
 
 # Chroma templates (12 semitones, root at index 0)
-_MAJOR_TEMPLATE = np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1], dtype=float)
-_MINOR_TEMPLATE = np.array([1, 0, 1, 1, 0, 1, 0, 1, 1, 0, 0, 1], dtype=float)  # natural minor
+_MAJOR_TEMPLATE = np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1], dtype=np.float32)
+_MINOR_TEMPLATE = np.array([1, 0, 1, 1, 0, 1, 0, 1, 1, 0, 0, 1], dtype=np.float32)  # natural minor
 _NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
 
 
@@ -2301,8 +3049,8 @@ def extract_scale_for_one_shot(y, sr, fundamental_freq=None):
         else:
             # Chord / polyphonic one-shot — fall back to Essentia KeyExtractor
             if essentia is not None:
-                key_extractor = es.KeyExtractor()
-                key, scale, strength = key_extractor(y.astype('float32'))
+                key_extractor = essentia_algorithm('KeyExtractor')
+                key, scale, strength = key_extractor(np.ascontiguousarray(y, dtype=np.float32))
                 key_estimate = f"{key} {scale}" if key and scale else None
                 return {
                     'key_estimate': key_estimate,
@@ -2312,6 +3060,7 @@ def extract_scale_for_one_shot(y, sr, fundamental_freq=None):
 
     except Exception as e:
         print(f"Warning: One-shot scale detection failed: {e}", file=sys.stderr)
+        mark_stage_degraded('key')
 
     return {'key_estimate': None, 'scale': None, 'key_strength': None}
 
@@ -2352,6 +3101,7 @@ def extract_transient_features(y_percussive, sr):
 
     except Exception as e:
         print(f"Warning: Transient feature extraction failed: {e}", file=sys.stderr)
+        mark_stage_degraded('transient')
 
     return features
 
@@ -2397,6 +3147,19 @@ def classify_percussion_subtype(transient_centroid, transient_flatness, crest_fa
     return (None, 0.0)
 
 
+# YAMNet classes that describe genre/context rather than an instrument
+_TAG_BLOCKLIST = frozenset({
+    'music', 'singing', 'song', 'speech', 'tender music', 'sad music',
+    'happy music', 'music of asia', 'music of africa', 'music of latin america',
+    'pop music', 'rock music', 'hip hop music', 'electronic music',
+    'christian music', 'wedding music', 'new-age music', 'independent music',
+    'theme music', 'background music', 'video game music', 'christmas music',
+    'dance music', 'soul music', 'gospel music', 'disco', 'funk',
+    'musical instrument', 'plucked string instrument', 'bowed string instrument',
+    'wind instrument, woodwind instrument', 'sound effect', 'noise',
+})
+
+
 def generate_tags(features):
     """
     Convert numeric features to instrument tags only.
@@ -2406,33 +3169,58 @@ def generate_tags(features):
     tags = []
 
     # Instrument tags from heuristic predictions (high confidence only)
-    for pred in features.get('instrument_predictions', []):
-        if pred['confidence'] > 0.55:
-            tags.append(pred['name'])
+    tags.extend(
+        pred['name'] for pred in features.get('instrument_predictions', [])
+        if pred['confidence'] > 0.55
+    )
 
     # ML Instrument tags (Phase 4) — only instrument classifications
-    tag_blocklist = {
-        'music', 'singing', 'song', 'speech', 'tender music', 'sad music',
-        'happy music', 'music of asia', 'music of africa', 'music of latin america',
-        'pop music', 'rock music', 'hip hop music', 'electronic music',
-        'christian music', 'wedding music', 'new-age music', 'independent music',
-        'theme music', 'background music', 'video game music', 'christmas music',
-        'dance music', 'soul music', 'gospel music', 'disco', 'funk',
-        'musical instrument', 'plucked string instrument', 'bowed string instrument',
-        'wind instrument, woodwind instrument', 'sound effect', 'noise',
-    }
     if features.get('instrument_classes') is not None:
         for instrument in features['instrument_classes']:
             if instrument['confidence'] >= 0.6:
                 class_name = instrument['class'].lower()
                 class_name = class_name.replace('musical instrument, ', '')
                 class_name = class_name.replace('music, ', '')
-                if class_name in tag_blocklist or '/m/' in class_name:
+                if class_name in _TAG_BLOCKLIST or '/m/' in class_name:
                     continue
                 tags.append(class_name)
 
     # Return unique tags (preserving order)
-    return list(dict.fromkeys(tags))
+    seen = set()
+    unique_tags = []
+    for tag in tags:
+        if tag not in seen:
+            seen.add(tag)
+            unique_tags.append(tag)
+    return unique_tags
+
+
+def warm_up():
+    """
+    Run a tiny dummy trim_silence + pyin so numba compiles the jitted kernels
+    pyin uses (Viterbi decoding) and the preprocessing path is exercised before
+    the first real request instead of during it. Skipped in safe mode, where
+    JIT is disabled anyway.
+    """
+    if SAFE_MODE:
+        return
+
+    step_start = time.time()
+    try:
+        dummy = np.random.default_rng(0).standard_normal(8192).astype(np.float32) * 0.1
+        trim_silence(dummy, top_db=30)
+        librosa.pyin(
+            dummy,
+            fmin=librosa.note_to_hz('C2'),
+            fmax=librosa.note_to_hz('C7'),
+            sr=44100,
+            frame_length=2048,
+            hop_length=512
+        )
+    except Exception as e:
+        debug_log(f"Warm-up failed: {e}")
+        return
+    debug_log(f"Warm-up complete [{(time.time()-step_start)*1000:.0f}ms]")
 
 
 def worker_loop():
@@ -2449,6 +3237,9 @@ def worker_loop():
       → {"id": "x", "cmd": "ping"}        ← {"id": "x", "result": "pong"}
       → {"id": "x", "cmd": "shutdown"}    ← {"id": "x", "result": "bye"} then exit
     """
+    # Compile jitted code paths up front so the first request is not slowed down
+    warm_up()
+
     # Signal that all imports are done and worker is ready
     sys.stdout.write(json.dumps({"status": "ready"}) + "\n")
     sys.stdout.flush()
@@ -2526,18 +3317,76 @@ def worker_loop():
             sys.stdout.flush()
 
 
+def audio_path_error(audio_path):
+    """Return an error message if audio_path is not an existing file, else None."""
+    if not os.path.exists(audio_path):
+        return f"File not found: {audio_path}"
+    if not os.path.isfile(audio_path):
+        return f"Path is not a file: {audio_path}"
+    return None
+
+
+def analyze_batch_entry(audio_path, analysis_level='advanced'):
+    """
+    Analyze one file of a batch, using its basename as the filename hint.
+    Returns {"audio_path", "result"} or {"audio_path", "error"}.
+    """
+    error = audio_path_error(audio_path)
+    if error:
+        return {"audio_path": audio_path, "error": error}
+    try:
+        result = analyze_audio(audio_path, analysis_level=analysis_level,
+                               filename=os.path.basename(audio_path))
+        return {"audio_path": audio_path, "result": result}
+    except Exception as e:
+        return {"audio_path": audio_path, "error": str(e)}
+    finally:
+        gc.collect()
+
+
+def init_batch_worker():
+    """Keep each batch worker process to one extractor thread (jobs already parallelize)"""
+    global ANALYSIS_THREADS
+    ANALYSIS_THREADS = 1
+
+
+def analyze_batch(audio_paths, analysis_level='advanced', jobs=1):
+    """
+    Analyze several files in one process so imports, model loads and JIT
+    warm-up are paid once. Filenames for sample type hints are taken from
+    each path's basename. With jobs > 1 the files are spread over that many
+    worker processes (each pays its own imports and model loads once). Workers
+    are spawned rather than forked, since forking after librosa/numba/Essentia
+    have started their native thread pools can deadlock.
+    Returns a list of {"audio_path", "result"} or {"audio_path", "error"} entries,
+    in input order.
+    """
+    if jobs <= 1 or len(audio_paths) <= 1:
+        return [analyze_batch_entry(audio_path, analysis_level) for audio_path in audio_paths]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(audio_paths)),
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=init_batch_worker) as pool:
+        return list(pool.map(analyze_batch_entry, audio_paths,
+                             [analysis_level] * len(audio_paths)))
+
+
 def main():
     """Entry point for the script"""
     import argparse
 
     parser = argparse.ArgumentParser(description='Analyze audio file features')
-    parser.add_argument('audio_file', nargs='?', default=None, help='Path to audio file')
+    parser.add_argument('audio_files', nargs='*', metavar='audio_file',
+                        help='Path to audio file; pass several to analyze them in one process '
+                             '(prints a JSON list of {audio_path, result|error})')
     parser.add_argument('--level', choices=['advanced'],
                         default='advanced', help='Analysis level (default: advanced)')
     parser.add_argument('--filename', default=None,
                         help='Original filename (used for sample type detection hints)')
     parser.add_argument('--worker', action='store_true',
                         help='Run in persistent worker mode (JSON stdin/stdout)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes used when several audio files are given (default: 1)')
 
     args = parser.parse_args()
 
@@ -2545,20 +3394,26 @@ def main():
         worker_loop()
         return
 
-    if not args.audio_file:
+    if not args.audio_files:
         parser.error('audio_file is required (unless using --worker mode)')
 
-    # Validate file exists and is readable
-    if not os.path.exists(args.audio_file):
-        print(json.dumps({"error": f"File not found: {args.audio_file}"}))
-        sys.exit(1)
+    if len(args.audio_files) > 1:
+        if args.filename:
+            parser.error('--filename can only be used with a single audio_file')
+        results = analyze_batch(args.audio_files, analysis_level=args.level, jobs=args.jobs)
+        print(json.dumps(results, indent=2))
+        return
 
-    if not os.path.isfile(args.audio_file):
-        print(json.dumps({"error": f"Path is not a file: {args.audio_file}"}))
+    audio_file = args.audio_files[0]
+
+    # Validate file exists and is readable
+    error = audio_path_error(audio_file)
+    if error:
+        print(json.dumps({"error": error}))
         sys.exit(1)
 
     try:
-        results = analyze_audio(args.audio_file, analysis_level=args.level, filename=args.filename)
+        results = analyze_audio(audio_file, analysis_level=args.level, filename=args.filename)
         print(json.dumps(results, indent=2))
     except Exception as e:
         print(json.dumps({"error": str(e)}))